@@ -4,6 +4,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from style_utils import set_app_config, load_custom_css
+from asset_utils import optimized_image
 
 os.chdir(os.path.dirname(__file__))
 
@@ -22,7 +23,7 @@ st.markdown('<div class="centered-title">NBA Data Science Projekt</div>', unsafe
 
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
-    st.image("images/nba.jpg", width=900)
+    st.image(optimized_image("images/nba.jpg", 900), width=900)
 
 # Zeige eine Information mit zusätzlichen Hinweisen zur Bedienung der App
 st.markdown("""
@@ -47,13 +48,13 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 col4, col5, col6 = st.columns(3)
 
 col4.metric("🏆 Erste Meistermannschaft", "Philadelphia Warriors", "1947")
-col4.image("images/golden_state_warriors.png", width=150)
+col4.image(optimized_image("images/golden_state_warriors.png", 150), width=150)
 
 col5.metric("📈 Längste Siegesserie", "LA Lakers, 1971/72", "33 Spiele")
-col5.image("images/la_lakers.png", width=150)
+col5.image(optimized_image("images/la_lakers.png", 150), width=150)
 
 col6.metric("🔥 Punkterekord in einem Spiel", "Wilt Chamberlain, 1962", "100 Punkte")
-col6.image("images/wilt_chamberlain.jpeg", width=150)
+col6.image(optimized_image("images/wilt_chamberlain.jpeg", 150), width=150)
 
 
 st.markdown("<br><br>", unsafe_allow_html=True)
@@ -61,13 +62,13 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 col7, col8, col9 = st.columns(3)
 
 col7.metric("🔥 Playoff-Rekordpunkte", "Michael Jordan, 1986", "63 Punkte")
-col7.image("images/michael_jordan.jpeg", width=150)
+col7.image(optimized_image("images/michael_jordan.jpeg", 150), width=150)
 
 col8.metric("💎 Meiste MVPs", "Kareem Abdul-Jabbar", "6 MVPs")
-col8.image("images/kareem-abdul-jabbar.jpg", width=150)
+col8.image(optimized_image("images/kareem-abdul-jabbar.jpg", 150), width=150)
 
 col9.metric("✊ Erster afroamerikanischer NBA-Spieler", "Earl Lloyd", "1950")
-col9.image("images/earl_lloyd.jpg", width=150)
+col9.image(optimized_image("images/earl_lloyd.jpg", 150), width=150)
 
 st.markdown("<br><br><br>", unsafe_allow_html=True)
 
@@ -144,4 +145,4 @@ fig.update_layout(
 fig.update_traces(
     hovertemplate="<b>%{y}</b><br>%{customdata[0]}<br>Karriere: %{customdata[1]} – %{customdata[2]}<extra></extra>"
 )
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,281 @@
+import numpy as np
+
+from data_utils import load_derived, player_rows
+from import_utils import lazy_import
+from model_utils import ML_DATASET, TARGETS
+
+hierarchy = lazy_import("scipy.cluster.hierarchy")
+
+
+# ------------------------------------------------------------------
+# Perzentil-Index
+# ------------------------------------------------------------------
+def build_percentile_index(df, group_col, columns) -> dict:
+    """Sortierte Werte (ohne NaN) je (Gruppe, Spalte) für schnelle Perzentil-Abfragen"""
+    index = {}
+    for group, group_df in df.groupby(group_col):
+        for col in columns:
+            values = group_df[col].dropna().to_numpy(dtype=float)
+            index[(group, col)] = np.sort(values)
+    return index
+
+
+def percentile_of(index, key, score):
+    """Perzentil eines Werts innerhalb seiner Gruppe (wie ``percentileofscore(kind='weak')``)"""
+    values = index.get(key)
+    if values is None or values.size == 0:
+        return None
+    return np.searchsorted(values, score, side="right") / values.size * 100
+
+
+def value_range(index, key):
+    """Minimum und Maximum einer Gruppe oder ``None``, falls keine Werte vorhanden sind"""
+    values = index.get(key)
+    if values is None or values.size == 0:
+        return None
+    return values[0], values[-1]
+
+
+def feature_bounds(index, lbl, feature):
+    """Min/Max einer Positionsgruppe für die Spielerwerte; Max ist ``None`` ohne Werte"""
+    feature_range = value_range(index, (lbl, feature))
+    # Sonderfälle (Draft Alter > 0 und Draft Nummer 0 -> 61 sind im Index berücksichtigt)
+    if feature == "draft_age":
+        min_score = max(18, feature_range[0]) if feature_range else 18
+    else:
+        min_score = feature_range[0] if feature_range else 0
+
+    if feature == "draft_number":
+        max_score = 60
+    else:
+        max_score = feature_range[1] if feature_range else None
+    return min_score, max_score
+
+
+def _position_index(df):
+    features = ["height", "weight", "bmi", "draft_age", "draft_number",
+                "stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"]
+    prepared = df.copy()
+    # Sonderfälle der Positionsvergleiche: Undrafted (Alter 0) ausblenden, Draft Nummer 0 -> 61
+    prepared["draft_age"] = prepared["draft_age"].where(prepared["draft_age"] > 0)
+    prepared["draft_number"] = prepared["draft_number"].replace(0, 61)
+    return build_percentile_index(prepared, "pos_cluster", features + list(TARGETS.values()))
+
+
+def position_percentile_index(path=ML_DATASET) -> dict:
+    """Perzentil-Index des ML-Datensatzes je (Position, Feature/Score-Spalte)"""
+    return load_derived(path, "position_percentile_index", _position_index)
+
+
+# ------------------------------------------------------------------
+# Korrelationen
+# ------------------------------------------------------------------
+def cluster_corr_matrix(corr_matrix):
+    """Korrelationsmatrix nach Clustern sortieren"""
+    # Berechnung der Distanzen zwischen den Merkmalen
+    row_linkage = hierarchy.linkage(corr_matrix, method='ward', metric='euclidean')
+    col_linkage = hierarchy.linkage(corr_matrix.T, method='ward', metric='euclidean')
+
+    # Ermitteln der Reihenfolge der Zeilen und Spalten
+    row_order = hierarchy.leaves_list(row_linkage)
+    col_order = hierarchy.leaves_list(col_linkage)
+
+    # Sortieren der Matrix
+    clustered = corr_matrix.iloc[row_order, col_order]
+    return clustered
+
+
+# Spalten, die in der Korrelations-Heatmap (Explorative Analyse) nicht gezeigt werden
+CORR_DROP_COLS = ['stl_pct_calc', 'allstar_pct_calc', 'avg_age', 'stand_jump',
+                  'max_jump', 'court_sprint', 'end_age', 'lane_agility',
+                  'bench_press', 'fg_pct_calc', 'usg_pct_calc', 'orb_pct_calc',
+                  'drb_pct_calc', 'net_rating_calc', 'all_star_total',
+                  'score_guard', 'score_wing', 'score_big', 'score_nach_cluster',
+                  'success_score']
+
+
+def clustered_correlation(path, drop_cols=CORR_DROP_COLS):
+    """Geclusterte Korrelationsmatrix, einmal pro Datenstand und Spaltenauswahl berechnet"""
+    drop_cols = frozenset(drop_cols)
+    return load_derived(
+        path,
+        ("clustered_correlation", drop_cols),
+        lambda df: cluster_corr_matrix(df.drop(columns=list(drop_cols)).corr()),
+    )
+
+
+def slice_correlation(clustered, columns):
+    """Teilmatrix für ausgewählte Merkmale, Cluster-Reihenfolge bleibt erhalten"""
+    selected = set(columns)
+    rows = [c for c in clustered.index if c in selected]
+    cols = [c for c in clustered.columns if c in selected]
+    return clustered.loc[rows, cols]
+
+
+# ------------------------------------------------------------------
+# Filter-Index (Draft-Analysen)
+# ------------------------------------------------------------------
+def build_filter_index(df, columns, range_col, order_col) -> dict:
+    """Positionsindizes je Wert, sortierte Bereichsspalte und Vorsortierung für Top-N-Abfragen"""
+    range_values = df[range_col].to_numpy(dtype=float)
+    range_order = np.argsort(range_values, kind="stable")
+    order_values = df[order_col].to_numpy(dtype=float)
+    positions = {
+        col: {value: idx.astype(np.int32)
+              for value, idx in df.groupby(col, observed=True).indices.items()}
+        for col in columns
+    }
+    return {
+        "n": len(df),
+        "positions": positions,
+        # Spalten ohne fehlende Werte: Auswahl aller Werte entspricht "kein Filter"
+        "complete": {col: df[col].notna().all() for col in columns},
+        "range_order": range_order,
+        "range_sorted": range_values[range_order],
+        # NaN landen wie bei sort_values am Ende
+        "order_desc": np.argsort(-order_values, kind="stable"),
+        "order_asc": np.argsort(order_values, kind="stable"),
+    }
+
+
+def value_mask(index, col, values):
+    """Boolesche Maske aller Zeilen, deren Wert in ``values`` liegt (wie ``isin``)"""
+    mask = np.zeros(index["n"], dtype=bool)
+    positions = index["positions"][col]
+    for value in values:
+        idx = positions.get(value)
+        if idx is not None:
+            mask[idx] = True
+    return mask
+
+
+def filter_mask(index, selections: dict, value_range=None):
+    """Schnittmenge aller Filter; vollständig ausgewählte Spalten werden übersprungen"""
+    mask = np.ones(index["n"], dtype=bool)
+    for col, values in selections.items():
+        if index["complete"][col] and set(index["positions"][col]) <= set(values):
+            continue
+        mask &= value_mask(index, col, values)
+
+    if value_range is not None:
+        values = index["range_sorted"]
+        lo = np.searchsorted(values, value_range[0], side="left")
+        hi = np.searchsorted(values, value_range[1], side="right")
+        if lo > 0 or hi < index["n"]:
+            in_range = np.zeros(index["n"], dtype=bool)
+            in_range[index["range_order"][lo:hi]] = True
+            mask &= in_range
+    return mask
+
+
+def first_matches(order, mask, n=10, chunk=4096):
+    """Die ersten ``n`` Treffer in vorsortierter Reihenfolge, ohne erneut zu sortieren"""
+    found = []
+    remaining = n
+    for start in range(0, len(order), chunk):
+        block = order[start:start + chunk]
+        hits = block[mask[block]][:remaining]
+        found.append(hits)
+        remaining -= len(hits)
+        if remaining == 0:
+            break
+    return np.concatenate(found) if found else np.array([], dtype=int)
+
+
+def draft_filter_index(path="data/data_analyse_60_height_draft.csv") -> dict:
+    """Filter-Index des Draft-Datensatzes, einmal pro Datenstand"""
+    return load_derived(
+        path,
+        "draft_filter_index",
+        lambda df: build_filter_index(df, ["d_group", "pos_cluster_calc", "draft_number"],
+                                      "sum_mp", "score_d_number_diff"),
+    )
+
+
+# ------------------------------------------------------------------
+# Dreipunktewurf-Aggregate
+# ------------------------------------------------------------------
+THREE_POINT_BASE_SEASON = 1982
+# Kennzahl -> Spaltenname der normierten Reihe (Basisjahr = 100)
+THREE_POINT_METRICS = {"fg3_pct": "fg3_norm", "fg3a_per_fga_pct": "fg3a_norm"}
+
+
+def _finish_aggregate(agg, base):
+    """Mittelwerte aus Summe/Anzahl und normierte Reihen ergänzen"""
+    out = agg.copy()
+    out.columns = [f"{metric}_{stat}" for metric, stat in out.columns]
+    for metric, norm_col in THREE_POINT_METRICS.items():
+        out[metric] = out[f"{metric}_sum"] / out[f"{metric}_count"].where(out[f"{metric}_count"] > 0)
+        out[norm_col] = out[metric] / base[metric] * 100
+    return out
+
+
+def build_three_point_cube(df, base_season=THREE_POINT_BASE_SEASON) -> dict:
+    """Summen und Anzahlen der Wurfquoten je Saison (ligaweit) samt Basisjahr"""
+    metrics = list(THREE_POINT_METRICS)
+    data = df[["season"] + metrics]
+
+    league = data.groupby("season")[metrics].agg(["sum", "count"])
+    league_means = league.xs("sum", axis=1, level=1) / league.xs("count", axis=1, level=1)
+    if base_season in league_means.index:
+        base = league_means.loc[base_season]
+    else:
+        base = {metric: np.nan for metric in metrics}
+
+    return {
+        "league": _finish_aggregate(league, base).reset_index(),
+        "base": dict(base),
+    }
+
+
+def three_point_cube(path="data/NBA_Dataset.csv") -> dict:
+    """Vorberechnete Dreipunkt-Aggregate, einmal pro Datenstand"""
+    return load_derived(path, "three_point_cube", build_three_point_cube)
+
+
+def three_point_player(path, player):
+    """Saisonwerte eines Spielers; liest über den Spieler-Index nur dessen Zeilen"""
+    metrics = list(THREE_POINT_METRICS)
+    rows = player_rows(path, player)[["season"] + metrics]
+    agg = rows.groupby("season")[metrics].agg(["sum", "count"]).sort_index()
+    return _finish_aggregate(agg, three_point_cube(path)["base"]).reset_index()
+
+
+# ------------------------------------------------------------------
+# MVPs vs. Nicht-MVPs
+# ------------------------------------------------------------------
+MVP_METRICS = ["pts_per_g", "ast_per_g", "trb_per_g", "per", "ws"]
+EFFICIENCY_METRICS = ["ts_pct", "efg_pct"]
+
+
+def build_mvp_tables(df) -> dict:
+    """MVP-Kandidaten, Saison-Mittelwerte aller Saisons und Effizienzvergleich in einem Durchlauf"""
+    is_mvp = df["award_share"] > 0
+
+    # Saison-Mittelwerte: nur vollständige Zeilen mit mindestens 60 Minuten
+    season_df = df[["season", "mp"] + MVP_METRICS].assign(is_mvp=is_mvp).dropna(subset=MVP_METRICS)
+    season_df = season_df[season_df["mp"] >= 60]
+    season_averages = season_df.groupby(["season", "is_mvp"])[MVP_METRICS].mean()
+
+    efficiency_df = df[EFFICIENCY_METRICS].assign(is_mvp=is_mvp).dropna()
+    efficiency = efficiency_df.groupby("is_mvp")[EFFICIENCY_METRICS].mean()
+
+    return {
+        "candidates": df[is_mvp],
+        "seasons": sorted(df["season"].dropna().unique()),
+        "season_averages": season_averages,
+        "efficiency": efficiency,
+    }
+
+
+def mvp_tables(path="data/NBA_Dataset.csv") -> dict:
+    """Vorberechnete MVP-Tabellen, einmal pro Datenstand"""
+    return load_derived(path, "mvp_tables", build_mvp_tables)
+
+
+def mvp_season_averages(tables, season):
+    """Mittelwerte einer Saison je MVP-Status (Spalten ``is_mvp`` + Kennzahlen)"""
+    averages = tables["season_averages"]
+    if season not in averages.index.get_level_values("season"):
+        return averages.iloc[:0].reset_index(level="season", drop=True).reset_index()
+    return averages.loc[season].reset_index()
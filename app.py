@@ -0,0 +1,28 @@
+"""Einstiegspunkt für den Serverbetrieb: ``streamlit run app.py``.
+
+Startet das Warm-up einmal beim Serverstart (nicht erst beim ersten Seitenaufruf) und
+meldet unter ``/warmup`` den Warm-up-Status dieses Serverprozesses. Die Seiten laufen über
+``navigation.py``, das jeden Seitenlauf misst.
+"""
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import warmup
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warmup.start_background()
+    yield
+
+
+async def warmup_status(request):
+    """Health-Check: 200 sobald bereit, sonst 503"""
+    state = warmup.status()
+    return JSONResponse(state, status_code=200 if state["status"] == "ready" else 503)
+
+
+app = st.App("navigation.py", lifespan=lifespan, routes=[Route("/warmup", warmup_status)])
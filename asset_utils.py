@@ -0,0 +1,126 @@
+"""Statische Assets (CSS, Bilder) einmal pro Prozess lesen statt bei jedem Rerun.
+
+Texte und Base64-Kodierungen werden pro Datei und Änderungsstand im Speicher gehalten.
+Für Bilder erzeugt der Build-Schritt ``python asset_utils.py`` verkleinerte WebP-Varianten
+in ``images/optimized/`` (doppelte Anzeigebreite für hochauflösende Displays). Fehlt eine
+Variante oder ist sie älter als das Original, wird das Original ausgeliefert.
+"""
+import base64
+import threading
+from pathlib import Path
+
+from import_utils import lazy_import
+
+# Pillow wird nur im Build-Schritt benötigt
+Image = lazy_import("PIL.Image")
+
+IMAGE_DIR = Path("images")
+OPTIMIZED_DIR = IMAGE_DIR / "optimized"
+RETINA_SCALE = 2
+WEBP_QUALITY = 82
+
+# Anzeigebreiten (px) der Bilder, wie sie in den Seiten verwendet werden
+DISPLAY_WIDTHS = {
+    "nba.jpg": [900],
+    "golden_state_warriors.png": [150],
+    "la_lakers.png": [150],
+    "wilt_chamberlain.jpeg": [150],
+    "michael_jordan.jpeg": [150],
+    "kareem-abdul-jabbar.jpg": [150],
+    "earl_lloyd.jpg": [150],
+    "Isabelle.png": [200],
+    "Florian.jpg": [200],
+    "Anna.jpeg": [200],
+    "linkedin.png": [20],
+    "github.png": [20],
+}
+
+_MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _version(path):
+    stat = Path(path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _memoized(kind, path, load):
+    """Liefert ``load(path)`` aus dem Cache, solange sich die Datei nicht geändert hat"""
+    key = (kind, str(path))
+    version = _version(path)
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], False
+    value = load(path)
+    with _LOCK:
+        _CACHE[key] = (version, value)
+    return value, True
+
+
+def read_text(path):
+    """Textdatei (z. B. CSS) lesen; ``(inhalt, frisch_geladen)``"""
+    return _memoized("text", path, lambda p: Path(p).read_text(encoding="utf-8"))
+
+
+def variant_path(path, width) -> Path:
+    path = Path(path)
+    return OPTIMIZED_DIR / f"{path.stem}_{width}.webp"
+
+
+def optimized_image(path, width) -> str:
+    """Pfad der WebP-Variante für die Anzeigebreite ``width`` oder des Originals"""
+    variant = variant_path(path, width)
+    try:
+        if variant.stat().st_mtime_ns >= Path(path).stat().st_mtime_ns:
+            return str(variant)
+    except FileNotFoundError:
+        pass
+    return str(path)
+
+
+def image_data_uri(path, width=None) -> str:
+    """Bild als ``data:``-URI für Inline-HTML; nutzt die WebP-Variante, falls vorhanden"""
+    source = Path(optimized_image(path, width) if width else path)
+
+    def encode(p):
+        mime = _MIME.get(p.suffix.lower(), "application/octet-stream")
+        return f"data:{mime};base64,{base64.b64encode(p.read_bytes()).decode()}"
+
+    return _memoized("data_uri", source, encode)[0]
+
+
+def build_variant(path, width) -> Path:
+    """Skaliert ``path`` auf ``width * RETINA_SCALE`` px Breite und speichert es als WebP"""
+    target = variant_path(path, width)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(path) as img:
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        max_width = width * RETINA_SCALE
+        if img.width > max_width:
+            height = round(img.height * max_width / img.width)
+            img = img.resize((max_width, height), Image.LANCZOS)
+        img.save(target, "WEBP", quality=WEBP_QUALITY, method=6)
+    return target
+
+
+def build_all(widths=DISPLAY_WIDTHS):
+    """Erzeugt alle Varianten; liefert ``(quelle, ziel)``-Paare"""
+    built = []
+    for name, sizes in widths.items():
+        source = IMAGE_DIR / name
+        if not source.exists():
+            print(f"⚠️ {source} nicht gefunden – übersprungen.")
+            continue
+        for width in sizes:
+            built.append((source, build_variant(source, width)))
+    return built
+
+
+if __name__ == "__main__":
+    # Build-Schritt: python asset_utils.py
+    for source, target in build_all():
+        before, after = source.stat().st_size / 1e3, target.stat().st_size / 1e3
+        print(f"✅ {source} -> {target} ({before:.0f} KB -> {after:.0f} KB)")
@@ -0,0 +1,143 @@
+"""Batch-Scoring ganzer Draft-Klassen mit den Success-Score-Modellen.
+
+Beispiel:
+    python batch_score.py prospects.csv scores.parquet --chunksize 50000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analysis_utils import percentile_of, position_percentile_index
+from feature_utils import FEATURE_COLS, build_features
+from model_utils import TARGETS, available_positions, get_model
+
+SCORE_COLS = ["pred_score", "percentile"]
+# Ohne Größe und Gewicht (und damit BMI) wäre der Score nur imputiert; fehlende
+# Combine-Werte ergänzt das Modell wie im Training über den Median
+REQUIRED_INPUTS = ["height", "weight"]
+
+
+def score_frame(frame: pd.DataFrame, position: str = None) -> pd.DataFrame:
+    """Sagt den Success Score und das Perzentil innerhalb der Position vorher.
+
+    Zeilen ohne Modell für ihre Position oder ohne Pflichtwerte bleiben ohne Score (NaN).
+    """
+    features = build_features(frame)
+    positions = pd.Series(position, index=frame.index) if position else frame["position"]
+    complete = features[REQUIRED_INPUTS].notna().all(axis=1).to_numpy()
+    percentiles = position_percentile_index()
+
+    scored = frame.copy()
+    scored["pred_score"] = np.nan
+    scored["percentile"] = np.nan
+    for lbl in available_positions():
+        mask = (positions == lbl).to_numpy() & complete
+        if not mask.any():
+            continue
+        preds = get_model(lbl).predict(features[mask])
+        scored.loc[mask, "pred_score"] = preds
+        scored.loc[mask, "percentile"] = percentile_of(percentiles, (lbl, TARGETS[lbl]), preds)
+    return scored
+
+
+def _read_chunks(src: Path, chunksize: int):
+    if src.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(src, chunksize=chunksize)
+
+
+def output_schema(src: Path, columns):
+    """Festes Parquet-Schema der Ausgabe statt des Schemas des ersten Blocks.
+
+    Feature- und Score-Spalten sind float64, übrige Spalten behalten den Typ der
+    Parquet-Quelle bzw. werden aus einer CSV als Text übernommen. So passt auch ein
+    Block, in dem eine Spalte nur fehlende Werte enthält.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    source = pq.ParquetFile(src).schema_arrow if src.suffix == ".parquet" else None
+    fields = []
+    for col in columns:
+        if col in FEATURE_COLS or col in SCORE_COLS:
+            fields.append(pa.field(col, pa.float64()))
+        elif source is not None and col in source.names:
+            fields.append(source.field(col))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
+
+
+def score_file(src, dst, position: str = None, chunksize: int = 50_000) -> dict:
+    """Bewertet eine CSV/Parquet-Datei blockweise und schreibt das Ergebnis nach ``dst``"""
+    src, dst = Path(src), Path(dst)
+    rows = unscored = incomplete = 0
+    # Positionen ohne Modell -> Anzahl Zeilen
+    unknown = {}
+    models = set(available_positions())
+    writer = None
+    start = time.perf_counter()
+    try:
+        for i, chunk in enumerate(_read_chunks(src, chunksize)):
+            scored = score_frame(chunk, position)
+            rows += len(scored)
+            missing = scored["pred_score"].isna()
+            unscored += int(missing.sum())
+            labels = pd.Series(position, index=chunk.index) if position else chunk["position"]
+            no_model = ~labels.isin(models)
+            for lbl, count in labels[no_model].value_counts(dropna=False).items():
+                unknown[lbl] = unknown.get(lbl, 0) + int(count)
+            # ohne Score trotz Modell: Pflichtwerte fehlen
+            incomplete += int((missing & ~no_model).sum())
+            if dst.suffix == ".parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                if writer is None:
+                    writer = pq.ParquetWriter(dst, output_schema(src, scored.columns))
+                table = pa.Table.from_pandas(scored, preserve_index=False)
+                writer.write_table(table.cast(writer.schema))
+            else:
+                scored.to_csv(dst, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "unscored": unscored, "unknown_positions": unknown, "missing_inputs": incomplete,
+            "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Success Scores für eine Datei mit Prospects berechnen")
+    parser.add_argument("src", help="CSV- oder Parquet-Datei mit Combine-/Draft-Werten")
+    parser.add_argument("dst", help="Ausgabedatei (.csv oder .parquet)")
+    parser.add_argument("--position", choices=available_positions(),
+                        help="Position für alle Zeilen (sonst Spalte 'position')")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    stats = score_file(args.src, args.dst, args.position, args.chunksize)
+    if stats["unscored"]:
+        print(f"❌ {stats['unscored']} von {stats['rows']} Zeilen ohne Score:", file=sys.stderr)
+        if stats["unknown_positions"]:
+            details = ", ".join(f"{lbl}: {count}" for lbl, count in stats["unknown_positions"].items())
+            print(f"   kein Modell für Position – {details}; verfügbar: {', '.join(available_positions())}",
+                  file=sys.stderr)
+        if stats["missing_inputs"]:
+            print(f"   {stats['missing_inputs']} Zeilen ohne Pflichtwerte ({', '.join(REQUIRED_INPUTS)})",
+                  file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {stats['rows']} Zeilen in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} Zeilen/s) -> {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
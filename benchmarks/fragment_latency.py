@@ -0,0 +1,159 @@
+"""Laufzeitbericht für das Success-Score-Fragment (Seite 4).
+
+Vorher löste jede Eingabe einen Rerun der ganzen Seite aus, jetzt nur das Fragment.
+``AppTest`` führt bei jeder Interaktion immer das ganze Skript aus; gemessen wird daher:
+
+* Vorher: Rerun der ganzen Seite im Stand vor Einführung des Fragments (Basis-Commit,
+  per ``git archive`` in ein temporäres Verzeichnis entpackt), Wandzeit je ``AppTest``-Lauf.
+* Jetzt, ganze Seite: derselbe Rerun mit dem aktuellen Code (nur zur Einordnung).
+* Jetzt, Fragment: Laufzeit des Fragment-Körpers laut Span ``page.fragment`` – das ist,
+  was der Server bei einer Eingabe im Fragment ausführt.
+
+Beide Stände laufen in eigenen Prozessen mit denselben Eingaben; die Instrumentierung ist
+dort nur für Zeiten eingeschaltet (``NBA_PERF=1``, ``NBA_PERF_MEMORY=0``) und schreibt in
+eine temporäre Logdatei.
+
+Beispiel:
+    python benchmarks/fragment_latency.py --interactions 30
+    python benchmarks/fragment_latency.py --baseline d7b9fbe^
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGE_PATTERN = "pages/4_*.py"
+
+
+def _interact(at, rng):
+    """Eine zufällige Eingabe im Formular; danach Klick auf „Vorhersagen“ (zwei Reruns)"""
+    choice = rng.randrange(4)
+    if choice == 0:
+        yield at.slider(key="ml_height").set_value(rng.randint(170, 225))
+    elif choice == 1:
+        yield at.slider(key="ml_weight").set_value(rng.randint(70, 140))
+    elif choice == 2:
+        yield at.number_input(key="ml_stand_jump").set_value(round(rng.uniform(20, 40), 1))
+    else:
+        yield at.number_input(key="ml_court_sprint").set_value(round(rng.uniform(3.0, 3.6), 2))
+    yield at.button[0].click()
+
+
+def measure(args):
+    """Spielt die Eingaben gegen die Seite unter ``root`` ab (läuft in eigenem Prozess)"""
+    root, interactions, seed, perf_file = args
+    # vor dem ersten Import von perf_utils setzen: nur Zeiten, kein tracemalloc
+    os.environ.update(NBA_PERF="1", NBA_PERF_MEMORY="0", NBA_PERF_FILE=perf_file)
+    from streamlit.testing.v1 import AppTest
+
+    warnings.filterwarnings("ignore")
+    os.chdir(root)
+    sys.path.insert(0, str(root))
+    page = next(Path(root).glob(PAGE_PATTERN))
+    at = AppTest.from_file(str(page), default_timeout=300).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    # Spans des ersten Laufs (Modelle laden, Caches füllen) nicht mitzählen
+    Path(perf_file).write_text("")
+    rng = random.Random(seed)
+    wall = []
+    for _ in range(interactions):
+        for widget in _interact(at, rng):
+            start = time.perf_counter()
+            widget.run()
+            wall.append(time.perf_counter() - start)
+    with open(perf_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    fragment = [r["wall_ms"] / 1000 for r in records if r["span"] == "page.fragment"]
+    return {"wall": wall, "fragment": fragment}
+
+
+def default_baseline() -> str:
+    """Elternteil des Commits, der das Fragment auf Seite 4 eingeführt hat"""
+    page = next(ROOT.glob(PAGE_PATTERN)).relative_to(ROOT)
+    commits = subprocess.run(["git", "log", "--reverse", "--format=%h", "-S@st.fragment", "--", str(page)],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    if not commits:
+        raise RuntimeError("kein Commit mit @st.fragment gefunden – bitte --baseline angeben")
+    return f"{commits[0]}^"
+
+
+def checkout(rev, target: Path):
+    """Entpackt den Stand ``rev`` nach ``target`` und kopiert die Daten (ohne Cache) dazu"""
+    archive = subprocess.run(["git", "archive", "--format=tar", rev], cwd=ROOT,
+                             capture_output=True, check=True).stdout
+    tar_path = target / "src.tar"
+    tar_path.write_bytes(archive)
+    with tarfile.open(tar_path) as tar:
+        tar.extractall(target, filter="data")
+    tar_path.unlink()
+    (target / "data").mkdir(exist_ok=True)
+    for source in (ROOT / "data").iterdir():
+        if source.is_file():
+            shutil.copy2(source, target / "data" / source.name)
+
+
+def _stats(values):
+    ms = np.asarray(values) * 1000
+    return {
+        "n": int(ms.size),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def run(interactions: int = 30, seed: int = 0, baseline: str = None) -> dict:
+    baseline = baseline or default_baseline()
+    ctx = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="fragment_baseline_") as tmp:
+        checkout(baseline, Path(tmp))
+        perf_file = str(Path(tmp) / "perf.jsonl")
+        # nacheinander, damit sich die Messungen nicht gegenseitig bremsen
+        with ctx.Pool(processes=1) as pool:
+            before = pool.apply(measure, ((tmp, interactions, seed, perf_file),))
+        with ctx.Pool(processes=1) as pool:
+            now = pool.apply(measure, ((str(ROOT), interactions, seed, perf_file),))
+
+    return {
+        "baseline": baseline,
+        "Vorher: ganze Seite": _stats(before["wall"]),
+        "Jetzt: ganze Seite": _stats(now["wall"]),
+        "Jetzt: Fragment": _stats(now["fragment"]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rerun-Latenz: ganze Seite (vorher) vs. Success-Score-Fragment")
+    parser.add_argument("--interactions", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="Git-Revision ohne Fragment (Standard: Elternteil des Fragment-Commits)")
+    args = parser.parse_args(argv)
+
+    report = run(args.interactions, args.seed, args.baseline)
+    print(f"Basis: {report['baseline']} (Seite ohne Fragment), je {args.interactions} Eingaben + Klick")
+    print(f"{'':24}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Mittel (ms)':>13}")
+    for label in ("Vorher: ganze Seite", "Jetzt: ganze Seite", "Jetzt: Fragment"):
+        stats = report[label]
+        print(f"{label:24}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['mean_ms']:>13.1f}")
+    print("Seiten: Wandzeit je AppTest-Rerun (ganzes Skript); Fragment: Laufzeit des Fragment-Körpers,")
+    print("wie sie der Server bei einer Eingabe im Fragment ausführt (ohne Streamlit-Overhead).")
+    speedup = report["Vorher: ganze Seite"]["p50_ms"] / report["Jetzt: Fragment"]["p50_ms"]
+    print(f"⚡ {speedup:.1f}x schneller pro Interaktion (p50, vorher ganze Seite vs. Fragment)")
+
+
+if __name__ == "__main__":
+    main()
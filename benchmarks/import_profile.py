@@ -0,0 +1,73 @@
+"""Import-Profil je Seite (``python -X importtime``).
+
+Führt die Modul-Imports jeder Seite in einem frischen Interpreter aus und wertet das
+``-X importtime``-Protokoll aus: Gesamtzeit und die teuersten Pakete der obersten Ebene.
+
+Beispiel:
+    python benchmarks/import_profile.py
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES = ["1_*.py", "pages/2_*.py", "pages/3_*.py", "pages/4_*.py", "pages/5_*.py"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def page_imports(path) -> str:
+    """Import-Anweisungen der obersten Ebene einer Seite als Quelltext"""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in nodes)
+
+
+def profile(code: str) -> dict:
+    """Importzeit (ms) eines Code-Schnipsels in einem frischen Interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        # oberste Ebene: genau ein Leerzeichen Einrückung
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2)) / 1000
+    heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)
+    return {"total_ms": sum(top_level.values()), "top": heaviest[:8]}
+
+
+def run(pages=PAGES) -> dict:
+    report = {}
+    for pattern in pages:
+        path = next(ROOT.glob(pattern))
+        report[path.name] = profile(page_imports(path))
+    return report
+
+
+def print_report(report):
+    for page, stats in report.items():
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in stats["top"][:5])
+        print(f"{page:40} {stats['total_ms']:7.0f} ms  ({top})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importzeiten je Seite (-X importtime)")
+    parser.add_argument("--json", type=Path, help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    report = run()
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Lasttest: simulierte Scouts klicken sich parallel durch alle Seiten.
+
+Jede Session läuft in einem eigenen Prozess (``AppTest``) und spielt typische
+Interaktionen ab – Success-Score-Regler, Positionswechsel, Busts & Steals,
+Draft-Filter, Dreipunkt-Spieler und Saisonwahl. Gemessen werden Rerun-Latenzen
+(p50/p95/p99), Durchsatz und RSS je Session; das Ergebnis landet als JSON in
+``benchmarks/results/`` und lässt sich zwischen Commits vergleichen.
+
+Beispiel:
+    python benchmarks/load_test.py --sessions 8 --steps 40
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+PAGES = {
+    "homepage": "1_*.py",
+    "team": "pages/2_*.py",
+    "eda": "pages/3_*.py",
+    "ml": "pages/4_*.py",
+    "mvp": "pages/5_*.py",
+}
+
+
+def _page_file(pattern):
+    return str(next(ROOT.glob(pattern)))
+
+
+def _by_label(elements, label):
+    return next(e for e in elements if e.label.startswith(label))
+
+
+# ------------------------------------------------------------------
+# Szenarien: je Aufruf eine Interaktion, die einen Rerun auslöst
+# ------------------------------------------------------------------
+def _static(at, rng):
+    at.run()
+
+
+def _eda(at, rng):
+    section = at.radio(key="eda_section")
+    if rng.random() < 0.25:
+        section.set_value(rng.choice(section.options)).run()
+        return
+    if section.value.endswith("Draft-Analysen"):
+        if rng.random() < 0.5:
+            widget = _by_label(at.multiselect, "Draft-Gruppen")
+        else:
+            widget = _by_label(at.multiselect, "Positionsgruppen")
+        values = [v for v in widget.options if rng.random() < 0.7] or widget.options[:1]
+        widget.set_value(values).run()
+    elif section.value.endswith("Dreipunktewurf-Analysen"):
+        if rng.random() < 0.6:
+            widget = _by_label(at.selectbox, "🔍 Spieler wählen")
+            widget.set_value(rng.choice(widget.options[1:])).run()
+        else:
+            at.checkbox[rng.randrange(len(at.checkbox))].set_value(rng.random() < 0.5).run()
+    else:
+        widget = _by_label(at.multiselect, "Merkmale")
+        values = [v for v in widget.options if rng.random() < 0.8] or widget.options[:2]
+        widget.set_value(values).run()
+
+
+def _ml(at, rng):
+    section = at.radio(key="ml_section")
+    choice = rng.random()
+    if choice < 0.2:
+        section.set_value(rng.choice(section.options)).run()
+    elif section.value == "Success Score":
+        if choice < 0.35:
+            at.slider(key="ml_height").set_value(rng.randint(175, 225)).run()
+        elif choice < 0.5:
+            at.slider(key="ml_weight").set_value(rng.randint(75, 140)).run()
+        elif choice < 0.65:
+            widget = at.selectbox(key="ml_position")
+            widget.set_value(rng.choice(widget.options)).run()
+        elif choice < 0.8:
+            at.number_input(key="ml_stand_jump").set_value(round(rng.uniform(20, 40), 1)).run()
+        else:
+            at.button[0].click().run()
+    elif section.value == "Busts & Steals":
+        widget = at.selectbox[0]
+        widget.set_value(rng.choice(widget.options[1:])).run()
+    else:
+        at.toggle(key="ml_compact").set_value(rng.random() < 0.7).run()
+
+
+def _mvp(at, rng):
+    widget = _by_label(at.selectbox, "Wähle eine Saison")
+    widget.set_value(rng.choice(widget.options)).run()
+
+
+SCENARIOS = {
+    "homepage": _static,
+    "team": _static,
+    "eda": _eda,
+    "ml": _ml,
+    "mvp": _mvp,
+}
+
+
+# ------------------------------------------------------------------
+# Session (ein Prozess)
+# ------------------------------------------------------------------
+def run_session(args):
+    """Eine Session: Kaltstart, dann ``steps`` Interaktionen über alle Seiten verteilt"""
+    session_id, steps, seed, pages = args
+    from streamlit.testing.v1 import AppTest
+
+    warnings.filterwarnings("ignore")
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    rng = random.Random(seed + session_id)
+
+    apps, cold = {}, {}
+    for name in pages:
+        start = time.perf_counter()
+        apps[name] = AppTest.from_file(_page_file(PAGES[name]), default_timeout=300).run()
+        cold[name] = time.perf_counter() - start
+
+    latencies = {name: [] for name in pages}
+    errors = 0
+    start_session = time.perf_counter()
+    for _ in range(steps):
+        name = rng.choice(pages)
+        at = apps[name]
+        start = time.perf_counter()
+        try:
+            SCENARIOS[name](at, rng)
+        except Exception:  # noqa: BLE001 – fehlgeschlagene Interaktion zählen, Session fortsetzen
+            errors += 1
+            continue
+        latencies[name].append(time.perf_counter() - start)
+        errors += len(at.exception)
+
+    return {
+        "session": session_id,
+        "cold_start_seconds": cold,
+        "latencies": latencies,
+        "errors": errors,
+        "wall_seconds": time.perf_counter() - start_session,
+        # Linux: ru_maxrss in KiB
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _percentiles(values):
+    if not values:
+        return {"n": 0}
+    ms = np.asarray(values) * 1000
+    return {
+        "n": int(ms.size),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sessions=4, steps=30, seed=0, pages=tuple(PAGES)) -> dict:
+    """Startet ``sessions`` Prozesse gleichzeitig und fasst die Messwerte zusammen"""
+    pages = list(pages)
+    ctx = mp.get_context("spawn")
+    start = time.perf_counter()
+    with ctx.Pool(processes=sessions) as pool:
+        results = pool.map(run_session, [(i, steps, seed, pages) for i in range(sessions)])
+    wall = time.perf_counter() - start
+
+    all_latencies = [t for r in results for values in r["latencies"].values() for t in values]
+    # Durchsatz nur über die parallele Interaktionsphase (ohne Kaltstarts)
+    steady = max(r["wall_seconds"] for r in results)
+    rss = [r["max_rss_mb"] for r in results]
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"sessions": sessions, "steps": steps, "seed": seed, "pages": pages},
+        "wall_seconds": wall,
+        "steady_seconds": steady,
+        "reruns": len(all_latencies),
+        "throughput_reruns_per_sec": len(all_latencies) / steady if steady else 0.0,
+        "errors": sum(r["errors"] for r in results),
+        "latency": _percentiles(all_latencies),
+        "latency_by_page": {
+            name: _percentiles([t for r in results for t in r["latencies"][name]]) for name in pages
+        },
+        "cold_start_seconds": {
+            name: float(np.mean([r["cold_start_seconds"][name] for r in results])) for name in pages
+        },
+        "rss_mb_per_session": {"mean": float(np.mean(rss)), "max": float(np.max(rss))},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest mit parallelen AppTest-Sessions")
+    parser.add_argument("--sessions", type=int, default=4, help="gleichzeitige Sessions (je ein Prozess)")
+    parser.add_argument("--steps", type=int, default=30, help="Interaktionen pro Session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--output", type=Path, help="JSON-Datei (Standard: benchmarks/results/load_<commit>_<zeit>.json)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, args.steps, args.seed, args.pages)
+    output = args.output or RESULTS_DIR / f"load_{report['commit'] or 'local'}_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    lat = report["latency"]
+    print(f"{report['reruns']} Reruns in {report['steady_seconds']:.1f}s "
+          f"({report['throughput_reruns_per_sec']:.1f}/s, {report['errors']} Fehler)")
+    print(f"Latenz p50/p95/p99: {lat['p50_ms']:.0f} / {lat['p95_ms']:.0f} / {lat['p99_ms']:.0f} ms")
+    for name, stats in report["latency_by_page"].items():
+        if stats["n"]:
+            print(f"  {name:9} n={stats['n']:<4} p50={stats['p50_ms']:.0f} ms  p95={stats['p95_ms']:.0f} ms")
+    print(f"RSS je Session: Ø {report['rss_mb_per_session']['mean']:.0f} MB, "
+          f"max {report['rss_mb_per_session']['max']:.0f} MB -> {output}")
+
+
+if __name__ == "__main__":
+    main()
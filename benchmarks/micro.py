@@ -0,0 +1,337 @@
+"""Micro-Benchmarks der Daten- und Modell-Hotpaths (asv-ähnlich, ohne UI).
+
+Jeder Benchmark wird mit ``timeit`` automatisch kalibriert und mehrfach wiederholt;
+ausgegeben werden Minimum und Median je Aufruf. Datenabhängige Benchmarks laufen
+zusätzlich auf synthetisch vergrößerten Datensätzen (Standard: 1x, 10x, 100x),
+damit Skalierungsregressionen sichtbar werden.
+
+Beispiele:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --scales 1 10 --filter predict
+    python benchmarks/micro.py --compare benchmarks/results/micro_abc1234.json
+
+Zusätzlich wird das Import-Profil je Seite (``-X importtime``) erfasst.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+
+import analysis_utils  # noqa: E402
+import data_utils  # noqa: E402
+import model_utils  # noqa: E402
+from benchmarks import import_profile  # noqa: E402
+from feature_utils import FEATURE_COLS  # noqa: E402
+
+CSV_FILES = ["numerical_data.csv", "data_analyse_60_height_draft.csv", "NBA_Dataset.csv"]
+DRAFT_CSV = data_utils.DATA_DIR / "data_analyse_60_height_draft.csv"
+NBA_CSV = data_utils.DATA_DIR / "NBA_Dataset.csv"
+NUMERICAL_CSV = data_utils.DATA_DIR / "numerical_data.csv"
+
+BENCHMARKS = []
+
+
+def benchmark(name, scaled=False):
+    """Registriert ``func(scale) -> callable``; ``scaled`` = läuft für jede Skalierung"""
+    def register(func):
+        BENCHMARKS.append((name, scaled, func))
+        return func
+    return register
+
+
+def scale_up(df, factor, seed=0):
+    """Vergrößert einen Datensatz um ``factor`` (Kopien mit leichtem Rauschen auf Float-Spalten)"""
+    if factor == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    frame = pd.concat([df] * factor, ignore_index=True)
+    for col in frame.select_dtypes(include="float").columns:
+        values = frame[col].to_numpy()
+        frame[col] = values * (1 + rng.normal(0, 0.01, len(frame))).astype(values.dtype)
+    if "player" in frame:
+        # eigene Spieler je Kopie, damit Gruppierungen mitwachsen
+        copy = np.repeat(np.arange(factor), len(df))
+        frame["player"] = frame["player"].astype(str) + np.where(copy > 0, " #" + pd.Series(copy).astype(str), "")
+    return frame
+
+
+_FRAMES = {}
+
+
+def frame(path, factor=1):
+    """Datensatz (einmal gelesen) in der gewünschten Größe"""
+    key = (Path(path), factor)
+    if key not in _FRAMES:
+        _FRAMES[key] = scale_up(data_utils.load_dataset(path), factor)
+    return _FRAMES[key]
+
+
+# ------------------------------------------------------------------
+# Laden
+# ------------------------------------------------------------------
+@benchmark("load.read_pickle_ml")
+def _(scale):
+    return lambda: pd.read_pickle(model_utils.ML_DATASET)
+
+
+for _name in CSV_FILES:
+    @benchmark(f"load.read_csv[{_name}]")
+    def _(scale, _name=_name):
+        return lambda: pd.read_csv(data_utils.DATA_DIR / _name)
+
+    @benchmark(f"load.columnar[{_name}]")
+    def _(scale, _name=_name):
+        path = data_utils.DATA_DIR / _name
+        data_utils.build_columnar(path)
+        return lambda: data_utils._read_csv(path)
+
+
+@benchmark("model.load_models")
+def _(scale):
+    def run():
+        model_utils._MODELS.clear()
+        for lbl in model_utils.available_positions():
+            model_utils.get_model(lbl)
+    return run
+
+
+# ------------------------------------------------------------------
+# Vorhersagen
+# ------------------------------------------------------------------
+def _ml_features(factor):
+    df = frame(model_utils.ML_DATASET, factor)
+    lbl = model_utils.available_positions()[0]
+    return lbl, df.loc[df[model_utils.TARGETS[lbl]].notna(), FEATURE_COLS]
+
+
+@benchmark("model.predict_single_row")
+def _(scale):
+    lbl, X = _ml_features(1)
+    model, row = model_utils.get_model(lbl), X.iloc[:1]
+    return lambda: model.predict(row)
+
+
+@benchmark("model.predict_one_cached")
+def _(scale):
+    lbl, X = _ml_features(1)
+    row = X.iloc[:1]
+    model_utils.predict_one(lbl, row)
+    return lambda: model_utils.predict_one(lbl, row)
+
+
+@benchmark("model.predict_holdout", scaled=True)
+def _(scale):
+    lbl, X = _ml_features(scale)
+    model = model_utils.get_model(lbl)
+    return lambda: model.predict(X)
+
+
+# ------------------------------------------------------------------
+# Perzentile
+# ------------------------------------------------------------------
+PERCENTILE_FEATURES = ["height", "weight", "bmi", "draft_age", "draft_number",
+                       "stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"]
+
+
+@benchmark("percentile.scipy_loop", scaled=True)
+def _(scale):
+    from scipy.stats import percentileofscore
+
+    df = frame(model_utils.ML_DATASET, scale)
+    df_pos = df[df["pos_cluster"] == df["pos_cluster"].iloc[0]]
+    values = {f: df_pos[f].median() for f in PERCENTILE_FEATURES}
+    return lambda: [percentileofscore(df_pos[f].dropna(), values[f], kind="weak") for f in PERCENTILE_FEATURES]
+
+
+@benchmark("percentile.index_lookup", scaled=True)
+def _(scale):
+    df = frame(model_utils.ML_DATASET, scale)
+    index = analysis_utils._position_index(df)
+    lbl = df["pos_cluster"].iloc[0]
+    values = {f: df[f].median() for f in PERCENTILE_FEATURES}
+    return lambda: [analysis_utils.percentile_of(index, (lbl, f), values[f]) for f in PERCENTILE_FEATURES]
+
+
+@benchmark("percentile.index_build", scaled=True)
+def _(scale):
+    df = frame(model_utils.ML_DATASET, scale)
+    return lambda: analysis_utils._position_index(df)
+
+
+# ------------------------------------------------------------------
+# Korrelationen
+# ------------------------------------------------------------------
+@benchmark("corr.cluster_corr_matrix", scaled=True)
+def _(scale):
+    df = frame(NUMERICAL_CSV, scale)
+    return lambda: analysis_utils.cluster_corr_matrix(df.corr())
+
+
+# ------------------------------------------------------------------
+# Draft-Filter
+# ------------------------------------------------------------------
+def _draft_selection(df, rng):
+    selections = {
+        col: [v for v in df[col].dropna().unique() if rng.random() < 0.6]
+        for col in ["d_group", "pos_cluster_calc", "draft_number"]
+    }
+    lo, hi = np.nanpercentile(df["sum_mp"].to_numpy(dtype=float), [10, 90])
+    return selections, (lo, hi)
+
+
+@benchmark("draft_filter.pandas_isin", scaled=True)
+def _(scale):
+    df = frame(DRAFT_CSV, scale)
+    selections, (lo, hi) = _draft_selection(df, np.random.default_rng(0))
+
+    def run():
+        mask = df["sum_mp"].between(lo, hi)
+        for col, values in selections.items():
+            mask &= df[col].isin(values)
+        return df[mask].sort_values("score_d_number_diff", ascending=False).head(10)
+    return run
+
+
+@benchmark("draft_filter.index_mask", scaled=True)
+def _(scale):
+    df = frame(DRAFT_CSV, scale)
+    index = analysis_utils.build_filter_index(df, ["d_group", "pos_cluster_calc", "draft_number"],
+                                              "sum_mp", "score_d_number_diff")
+    selections, value_range = _draft_selection(df, np.random.default_rng(0))
+
+    def run():
+        mask = analysis_utils.filter_mask(index, selections, value_range)
+        return df.iloc[analysis_utils.first_matches(index["order_desc"], mask, 10)]
+    return run
+
+
+@benchmark("draft_filter.index_build", scaled=True)
+def _(scale):
+    df = frame(DRAFT_CSV, scale)
+    return lambda: analysis_utils.build_filter_index(df, ["d_group", "pos_cluster_calc", "draft_number"],
+                                                     "sum_mp", "score_d_number_diff")
+
+
+# ------------------------------------------------------------------
+# Saison-Gruppierungen
+# ------------------------------------------------------------------
+@benchmark("season.mvp_tables", scaled=True)
+def _(scale):
+    df = frame(NBA_CSV, scale)
+    return lambda: analysis_utils.build_mvp_tables(df)
+
+
+@benchmark("season.three_point_cube", scaled=True)
+def _(scale):
+    df = frame(NBA_CSV, scale)
+    return lambda: analysis_utils.build_three_point_cube(df)
+
+
+@benchmark("season.player_index", scaled=True)
+def _(scale):
+    df = frame(NBA_CSV, scale)
+    return lambda: data_utils.build_player_index(df)
+
+
+# ------------------------------------------------------------------
+# Ausführung
+# ------------------------------------------------------------------
+def measure(func, repeat=5, min_time=0.2):
+    """Minimum/Median pro Aufruf in Sekunden (Schleifenzahl wie ``timeit`` kalibriert)"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"min": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:8.2f} {unit}"
+    return f"{seconds * 1e9:8.0f} ns"
+
+
+def run(scales=(1, 10, 100), pattern=None, repeat=5) -> dict:
+    results = {}
+    for name, scaled, factory in BENCHMARKS:
+        for scale in (scales if scaled else (1,)):
+            key = f"{name}@{scale}x" if scaled else name
+            if pattern and not re.search(pattern, key):
+                continue
+            try:
+                func = factory(scale)
+            except (FileNotFoundError, IndexError) as exc:
+                print(f"{key:55} übersprungen ({exc})")
+                continue
+            results[key] = measure(func, repeat=repeat)
+            print(f"{key:55} {_format(results[key]['min'])}  (Median {_format(results[key]['median']).strip()})")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-Benchmarks der Daten- und Modell-Hotpaths")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--filter", help="Regex auf Benchmark-Namen")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="JSON-Datei (Standard: benchmarks/results/micro_<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="früheres Ergebnis; zeigt Verhältnis neu/alt")
+    parser.add_argument("--no-imports", action="store_true", help="Import-Profil der Seiten überspringen")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    results = run(args.scales, args.filter, args.repeat)
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scales": args.scales,
+        "results": results,
+    }
+    if not args.no_imports:
+        print("\nImportzeiten je Seite (-X importtime):")
+        report["imports"] = import_profile.run()
+        import_profile.print_report(report["imports"])
+    output = args.output or RESULTS_DIR / f"micro_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"-> {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"\nVergleich mit {args.compare} (min neu / min alt):")
+        for key, stats in results.items():
+            if key in baseline["results"]:
+                ratio = stats["min"] / baseline["results"][key]["min"]
+                flag = "  ⚠️" if ratio > 1.2 else ""
+                print(f"{key:55} {ratio:6.2f}x{flag}")
+        for page, stats in report.get("imports", {}).items():
+            if page in baseline.get("imports", {}):
+                ratio = stats["total_ms"] / baseline["imports"][page]["total_ms"]
+                print(f"{'import ' + page:55} {ratio:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perf_utils import span
+
+DATA_DIR = Path("data")
+CACHE_DIR = DATA_DIR / "cache"
+
+# Typisierte Schemas für die spaltenorientierte Kopie der CSV-Quellen.
+# float32 nur für ausdrücklich gelistete Spalten (Anzeige, Mittelwerte); Spalten, die
+# gefiltert, sortiert oder korreliert werden, bleiben float64.
+SCHEMAS = {
+    "numerical_data.csv": {
+        "category": [],
+        "int": ["career_years", "all_star_total"],
+        # Quelle der Korrelationsmatrix: volle Genauigkeit
+        "float32": [],
+    },
+    "data_analyse_60_height_draft.csv": {
+        "category": ["pos_cluster_calc", "d_group", "team_id"],
+        "int": ["draft_number", "career_years", "all_star_total"],
+        # sum_mp (Bereichsfilter), success_score und die Draft-Nummer-Scores (Sortierung,
+        # Tabellen) bleiben float64
+        "float32": [
+            "ws_per_48_calc", "bpm_calc", "ts_pct_calc", "fg_pct_calc", "fg3_pct_calc", "pts_per_36_calc",
+            "stl_pct_calc", "trb_pct_calc", "blk_pct_calc", "mps_calc", "ast_pct_calc", "allstar_pct_calc",
+            "usg_pct_calc", "orb_pct_calc", "drb_pct_calc", "net_rating_calc",
+            "start_age", "end_age", "avg_age", "player_height", "player_weight",
+            "stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press",
+            "score_guard", "score_wing", "score_big", "score_nach_cluster",
+            "avg_score_d_group", "score_d_group_diff",
+        ],
+    },
+    "NBA_Dataset.csv": {
+        "category": ["team_id"],
+        "int": [],
+        # mp (Mindestminuten) und award_share (MVP-Status) bleiben float64
+        "float32": [
+            "fg3_pct", "fg3a_per_fga_pct", "pts_per_g", "ast_per_g", "trb_per_g", "per", "ws",
+            "ts_pct", "efg_pct",
+        ],
+    },
+}
+
+# Prozessweiter Cache: Pfad -> Eintrag mit Signatur, Hash, DataFrame und Ladezeit
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def apply_schema(frame: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """Wandelt einen CSV-Frame in die kompakten Typen des Schemas um"""
+    frame = frame.copy()
+    for col in schema["category"]:
+        if col in frame.columns:
+            frame[col] = frame[col].astype("category")
+    for col in schema["int"]:
+        if col in frame.columns and not frame[col].isna().any():
+            frame[col] = pd.to_numeric(frame[col], downcast="integer")
+    for col in schema["float32"]:
+        if col in frame.columns:
+            frame[col] = frame[col].astype(np.float32)
+    return frame
+
+
+def _restore_categories(frame: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """Parquet liefert Kategorien mit Ganzzahlwerten (z. B. d_group) als int64 zurück"""
+    for col in schema["category"]:
+        if col in frame.columns and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype("category")
+    return frame
+
+
+def columnar_path(path) -> Path:
+    """Pfad der Parquet-Kopie einer CSV-Datei; ein geändertes Schema ergibt eine neue Kopie"""
+    path = Path(path)
+    schema = json.dumps(SCHEMAS.get(path.name), sort_keys=True)
+    return CACHE_DIR / f"{path.stem}_{hashlib.md5(schema.encode()).hexdigest()[:8]}.parquet"
+
+
+def _columnar_fresh(path: Path) -> bool:
+    target = columnar_path(path)
+    return target.exists() and target.stat().st_mtime_ns >= path.stat().st_mtime_ns
+
+
+def write_atomic(path, write) -> Path:
+    """Schreibt über ``write(temp)`` in eine eigene Temp-Datei und ersetzt ``path`` danach atomar.
+
+    Leser sehen so immer eine vollständige Datei, auch wenn mehrere Prozesse oder
+    Threads dasselbe Artefakt gleichzeitig erzeugen.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def _write_columnar(frame: pd.DataFrame, path: Path) -> Path:
+    return write_atomic(columnar_path(path), lambda tmp: frame.to_parquet(tmp, index=False))
+
+
+def build_columnar(path) -> Path:
+    """Erzeugt die typisierte Parquet-Kopie einer CSV-Datei"""
+    path = Path(path)
+    return _write_columnar(apply_schema(pd.read_csv(path), SCHEMAS[path.name]), path)
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    """Liest eine CSV bevorzugt aus der Parquet-Kopie; ist sie veraltet, wird die CSV gelesen"""
+    schema = SCHEMAS.get(path.name)
+    if schema is None:
+        return pd.read_csv(path)
+    if _columnar_fresh(path):
+        try:
+            return _restore_categories(pd.read_parquet(columnar_path(path)), schema)
+        except (ImportError, OSError, ValueError):
+            pass
+
+    frame = apply_schema(pd.read_csv(path), schema)
+    try:
+        # Kopie für den nächsten Prozess automatisch nachziehen
+        _write_columnar(frame, path)
+    except (ImportError, OSError, ValueError):
+        pass
+    return frame
+
+
+_READERS = {
+    ".csv": _read_csv,
+    ".pkl": pd.read_pickle,
+}
+
+
+def _signature(path: Path):
+    """Günstige Änderungserkennung über mtime und Dateigröße"""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_hash(path) -> str:
+    """MD5-Hash des Dateiinhalts"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_dataset(path) -> pd.DataFrame:
+    """Lädt einen Datensatz einmal pro Prozess und gibt den geteilten Frame zurück.
+
+    Der Frame wird von allen Sessions gemeinsam genutzt und darf nicht verändert
+    werden – vor Änderungen ``.copy()`` verwenden. Neu geladen wird nur, wenn sich
+    mtime/Größe und zusätzlich der Inhalts-Hash der Datei geändert haben.
+    """
+    path = Path(path)
+    signature = _signature(path)
+
+    with _LOCK:
+        entry = _CACHE.get(path)
+        if entry is not None and entry["signature"] == signature:
+            return entry["frame"]
+
+        digest = file_hash(path)
+        if entry is not None and entry["hash"] == digest:
+            # Nur "touch" ohne inhaltliche Änderung
+            entry["signature"] = signature
+            return entry["frame"]
+
+        reader = _READERS[path.suffix]
+        start = time.perf_counter()
+        with span("data.load", dataset=path.name):
+            frame = reader(path)
+        elapsed = time.perf_counter() - start
+
+        _CACHE[path] = {
+            "signature": signature,
+            "hash": digest,
+            "frame": frame,
+            "load_seconds": elapsed,
+            "loaded_at": time.time(),
+            "derived": {},
+        }
+        return frame
+
+
+def load_derived(path, name, builder):
+    """Liefert ein aus dem Datensatz abgeleitetes Objekt (Index, Aggregat, …).
+
+    ``builder(frame)`` läuft einmal pro geladenem Datenstand; wird der Datensatz
+    neu geladen, werden auch alle abgeleiteten Objekte neu berechnet.
+    """
+    frame = load_dataset(path)
+    with _LOCK:
+        entry = _CACHE[Path(path)]
+        if entry["frame"] is not frame:
+            # Datensatz wurde zwischenzeitlich neu geladen
+            return builder(frame)
+        derived = entry["derived"]
+        if name in derived:
+            return derived[name]
+
+    with span("derived.build", dataset=Path(path).name, derived=name if isinstance(name, str) else name[0]):
+        value = builder(frame)
+    with _LOCK:
+        derived[name] = value
+    return value
+
+
+def dataset_hash(path) -> str:
+    """Inhalts-Hash des aktuell geladenen Datensatzes"""
+    load_dataset(path)
+    return _CACHE[Path(path)]["hash"]
+
+
+def load_timings() -> dict:
+    """Ladezeiten (Sekunden) und Ladezeitpunkte aller geladenen Datensätze"""
+    with _LOCK:
+        return {
+            str(path): {
+                "load_seconds": entry["load_seconds"],
+                "loaded_at": entry["loaded_at"],
+                "rows": len(entry["frame"]),
+            }
+            for path, entry in _CACHE.items()
+        }
+
+
+def clear_cache():
+    """Verwirft alle geladenen Datensätze"""
+    with _LOCK:
+        _CACHE.clear()
+
+
+
+# ------------------------------------------------------------------
+# Spieler-Index
+# ------------------------------------------------------------------
+def build_player_index(frame: pd.DataFrame, player_col: str = "player") -> dict:
+    """Zeilenreihenfolge nach Spieler sortiert plus zusammenhängender Bereich je Spieler"""
+    names = frame[player_col]
+    valid = np.flatnonzero(names.notna().to_numpy())
+    keys = names.to_numpy()[valid]
+    order = valid[np.argsort(keys, kind="stable")]
+    keys = names.to_numpy()[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=int)
+    stops = np.r_[starts[1:], len(keys)]
+    return {
+        "order": order.astype(np.int32),
+        "ranges": {keys[start]: (start, stop) for start, stop in zip(starts, stops)},
+        "players": [keys[start] for start in starts],
+    }
+
+
+def player_index(path, player_col: str = "player") -> dict:
+    """Spieler-Index eines Datensatzes, einmal pro Datenstand"""
+    return load_derived(path, ("player_index", player_col), lambda df: build_player_index(df, player_col))
+
+
+def player_names(path, player_col: str = "player") -> list:
+    """Sortierte Liste aller Spieler (ohne fehlende Namen)"""
+    return player_index(path, player_col)["players"]
+
+
+def player_rows(path, player, player_col: str = "player") -> pd.DataFrame:
+    """Alle Zeilen eines Spielers – Aufwand unabhängig von der Größe des Datensatzes"""
+    index = player_index(path, player_col)
+    start, stop = index["ranges"].get(player, (0, 0))
+    return load_dataset(path).iloc[index["order"][start:stop]]
+
+if __name__ == "__main__":
+    # Build-Schritt: python data_utils.py
+    for name in SCHEMAS:
+        source = DATA_DIR / name
+        if not source.exists():
+            print(f"⚠️ {source} nicht gefunden – übersprungen.")
+            continue
+        target = build_columnar(source)
+        csv_mb = pd.read_csv(source).memory_usage(deep=True).sum() / 1e6
+        typed_mb = pd.read_parquet(target).memory_usage(deep=True).sum() / 1e6
+        print(f"✅ {source} -> {target} ({csv_mb:.2f} MB -> {typed_mb:.2f} MB im Speicher)")
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Feature-Reihenfolge der trainierten Modelle
+FEATURE_COLS = [
+    "height", "weight", "bmi", "draft_flag", "draft_age", "draft_number", "draft_group",
+    "stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"
+]
+COMBINE_COLS = ["stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"]
+
+# Platzhalter für nicht gedraftete Spieler
+UNDRAFTED_NUMBER = 61
+UNDRAFTED_AGE = 0
+UNDRAFTED_GROUP = 7
+
+# Untergrenzen der Draft-Gruppen 2–6 (1=Pick 1–10, 2=11–20, …, 6=51–60)
+DRAFT_GROUP_BINS = np.array([11, 21, 31, 41, 51])
+
+
+def bmi(weight, height):
+    """BMI (kg/m²) aus Gewicht (kg) und Größe (cm) – für Skalare und Arrays"""
+    return weight / (np.asarray(height) / 100) ** 2
+
+
+def draft_group(draft_number):
+    """Draft-Gruppe 1–6 aus der Draft-Nummer (vektorisiert)"""
+    return np.digitize(draft_number, DRAFT_GROUP_BINS) + 1
+
+
+def _column(frame: pd.DataFrame, col: str) -> pd.Series:
+    """Numerische Spalte oder NaN, falls sie in der Eingabe fehlt"""
+    if col not in frame:
+        return pd.Series(np.nan, index=frame.index)
+    return pd.to_numeric(frame[col], errors="coerce")
+
+
+def build_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """Erzeugt die Modell-Features aus Rohwerten (eine Zeile oder beliebig viele).
+
+    Erwartet ``height``, ``weight``, ``draft_number``, ``draft_age`` und die Combine-Werte.
+    Eine fehlende Draft-Nummer oder eine Nummer außerhalb 1–60 gilt als undrafted
+    (Nummer 61, Alter 0, Gruppe 7). Der BMI wird wie bisher auf 2 Nachkommastellen gerundet.
+    """
+    height = _column(frame, "height")
+    weight = _column(frame, "weight")
+    number = _column(frame, "draft_number")
+    drafted = number.between(1, 60).to_numpy()
+
+    features = pd.DataFrame(index=frame.index)
+    features["height"] = height
+    features["weight"] = weight
+    features["bmi"] = bmi(weight, height).round(2)
+    features["draft_flag"] = drafted.astype(int)
+    features["draft_number"] = np.where(drafted, number, UNDRAFTED_NUMBER)
+    features["draft_age"] = np.where(drafted, _column(frame, "draft_age"), UNDRAFTED_AGE)
+    features["draft_group"] = np.where(drafted, draft_group(number.fillna(0)), UNDRAFTED_GROUP)
+    for col in COMBINE_COLS:
+        features[col] = _column(frame, col)
+    return features[FEATURE_COLS]
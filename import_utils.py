@@ -0,0 +1,52 @@
+import importlib
+import sys
+import threading
+from types import ModuleType
+
+_LOCK = threading.RLock()
+
+
+class LazyModule(ModuleType):
+    """Platzhalter, der das echte Modul erst beim ersten Attributzugriff importiert"""
+
+    def __init__(self, name, before=None):
+        super().__init__(name)
+        self.__dict__["_lazy_before"] = before
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with _LOCK:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    before = self.__dict__["_lazy_before"]
+                    if before is not None:
+                        before()
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # Folgezugriffe ohne Umweg über __getattr__
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "geladen" if self.__dict__["_lazy_module"] is not None else "nicht geladen"
+        return f"<LazyModule {self.__name__!r} ({state})>"
+
+
+def lazy_import(name, before=None):
+    """Modul verzögert importieren; ``before()`` läuft unmittelbar vor dem echten Import.
+
+    Ist das Modul bereits geladen, wird es direkt zurückgegeben.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, before)
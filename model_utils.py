@@ -0,0 +1,391 @@
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from zipfile import BadZipFile
+
+import numpy as np
+import pandas as pd
+
+from data_utils import CACHE_DIR, build_player_index, dataset_hash, file_hash, load_dataset, write_atomic
+from feature_utils import COMBINE_COLS, FEATURE_COLS, build_features
+from import_utils import lazy_import
+from perf_utils import ENABLED as PERF_ENABLED, span
+
+joblib = lazy_import("joblib")
+
+MODEL_DIR = Path("data")
+ML_DATASET = Path("data/1_dataset_ML.pkl")
+POSITIONS = ("Big", "Guard", "Wing")
+
+# Mapping Position -> Score-Spalte
+TARGETS = {"Big": "score_big", "Guard": "score_guard", "Wing": "score_wing"}
+
+# Prozessweite Modell-Registry: Position -> geladenes Modell inkl. Metadaten
+_MODELS = {}
+_LOCK = threading.Lock()
+
+# LRU-Cache für Einzelvorhersagen: (Position, Modell-Hash, Feature-Tupel) -> Score
+PREDICTION_CACHE_SIZE = 4096
+_PREDICTIONS = OrderedDict()
+_PREDICTION_STATS = {"hits": 0, "misses": 0}
+_PREDICTION_LOCK = threading.Lock()
+
+# Antwortflächen für Was-wäre-wenn-Analysen: (Position, Modell-Hash, Daten-Hash) -> Raster und
+# Rangfolge der Eingaben; je Position bleibt nur der aktuelle Stand im Speicher
+SURFACE_FEATURES = ["height", "weight", "draft_number", "draft_age"] + COMBINE_COLS
+SURFACE_POINTS = 25
+_SURFACES = {}
+# Sensitivitätskurven je Eingabe: (Position, Modell-Hash, Eingabe-Tupel, top) -> Kurven
+CURVE_CACHE_SIZE = 256
+_CURVES = OrderedDict()
+
+# Hold-out-Vorhersagen: (Position, Modell-Hash, Daten-Hash) -> Tabelle inkl. Indizes;
+# je Position bleibt nur der aktuelle Stand im Speicher
+_HOLDOUT = {}
+# gemeinsame Sperre für _SURFACES und _HOLDOUT
+_ARTIFACT_LOCK = threading.Lock()
+
+
+def model_path(lbl: str) -> Path:
+    return MODEL_DIR / f"best_model_{lbl}.pkl"
+
+
+def available_positions() -> list:
+    """Positionen, für die ein trainiertes Modell vorliegt (ohne es zu laden)"""
+    return [lbl for lbl in POSITIONS if model_path(lbl).exists()]
+
+
+def _signature(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load(path: Path):
+    """Lädt ein Modell und misst die Ladezeit.
+
+    Den Speicherbedarf misst tracemalloc nur bei aktivierter Instrumentierung (``NBA_PERF=1``),
+    da es das Laden deutlich verlangsamt. Der Wert ist nur ein Näherungswert: tracemalloc
+    zählt auch Allokationen anderer Threads (Warm-up, parallele Sessions) mit.
+    """
+    if not PERF_ENABLED:
+        start = time.perf_counter()
+        model = joblib.load(path)
+        return model, time.perf_counter() - start, None
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    try:
+        model = joblib.load(path)
+    finally:
+        elapsed = time.perf_counter() - start
+        after, _ = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+    return model, elapsed, max(after - before, 0)
+
+
+def get_model(lbl: str):
+    """Gibt das Modell einer Position zurück.
+
+    Jedes Modell wird erst bei Bedarf und nur einmal pro Prozess geladen und
+    von allen Sessions geteilt. Wird die Pickle-Datei ersetzt, lädt der nächste
+    Zugriff automatisch die neue Version.
+    """
+    path = model_path(lbl)
+    signature = _signature(path)
+
+    with _LOCK:
+        entry = _MODELS.get(lbl)
+        if entry is not None and entry["signature"] == signature:
+            return entry["model"]
+
+        with span("model.load", position=lbl):
+            model, elapsed, memory = _load(path)
+        _MODELS[lbl] = {
+            "signature": signature,
+            "hash": file_hash(path),
+            "model": model,
+            "load_seconds": elapsed,
+            "memory_bytes_approx": memory,
+            "file_bytes": signature[1],
+            "loaded_at": time.time(),
+        }
+        return model
+
+
+def model_hash(lbl: str) -> str:
+    """Inhalts-Hash der aktuell geladenen Modelldatei"""
+    get_model(lbl)
+    return _MODELS[lbl]["hash"]
+
+
+def model_stats() -> dict:
+    """Ladezeit und (ungefährer) Speicherbedarf der bisher geladenen Modelle"""
+    with _LOCK:
+        return {
+            lbl: {
+                key: entry[key]
+                for key in ("load_seconds", "memory_bytes_approx", "file_bytes", "loaded_at")
+            }
+            for lbl, entry in _MODELS.items()
+        }
+
+
+# ------------------------------------------------------------------
+# Einzelvorhersagen (Success Score)
+# ------------------------------------------------------------------
+def _normalize(value):
+    return None if pd.isna(value) else round(float(value), 4)
+
+
+def predict_one(lbl: str, features: pd.DataFrame) -> float:
+    """Vorhersage für eine Feature-Zeile; wiederholte Eingaben kommen aus dem LRU-Cache"""
+    row = features[FEATURE_COLS].iloc[0]
+    key = (lbl, model_hash(lbl), tuple(_normalize(v) for v in row))
+
+    with _PREDICTION_LOCK:
+        if key in _PREDICTIONS:
+            _PREDICTIONS.move_to_end(key)
+            _PREDICTION_STATS["hits"] += 1
+            return _PREDICTIONS[key]
+        _PREDICTION_STATS["misses"] += 1
+
+    with span("model.predict", position=lbl):
+        score = float(get_model(lbl).predict(features[FEATURE_COLS].iloc[:1])[0])
+    with _PREDICTION_LOCK:
+        _PREDICTIONS[key] = score
+        while len(_PREDICTIONS) > PREDICTION_CACHE_SIZE:
+            _PREDICTIONS.popitem(last=False)
+    return score
+
+
+def prediction_cache_stats() -> dict:
+    """Treffer, Fehlzugriffe und Trefferquote des Vorhersage-Caches"""
+    with _PREDICTION_LOCK:
+        hits, misses = _PREDICTION_STATS["hits"], _PREDICTION_STATS["misses"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "size": len(_PREDICTIONS),
+            "maxsize": PREDICTION_CACHE_SIZE,
+        }
+
+
+# ------------------------------------------------------------------
+# Hold-out-Vorhersagen (Busts & Steals)
+# ------------------------------------------------------------------
+def holdout_path(lbl: str) -> Path:
+    """Artefakt der Hold-out-Vorhersagen, eindeutig für Modell- und Datenstand"""
+    return CACHE_DIR / f"holdout_{lbl}_{model_hash(lbl)[:12]}_{dataset_hash(ML_DATASET)[:12]}.parquet"
+
+
+def build_holdout(lbl: str) -> pd.DataFrame:
+    """Berechnet True/Pred/Abweichung aller Spieler für das Modell einer Position"""
+    df = load_dataset(ML_DATASET)
+    y_true = df[TARGETS[lbl]].dropna()
+    X_hold = df.loc[y_true.index, FEATURE_COLS]
+    with span("model.holdout", position=lbl, rows=len(X_hold)):
+        y_pred = get_model(lbl).predict(X_hold)
+
+    table = pd.DataFrame(
+        {
+            "player": df.loc[y_true.index, "player"].values,
+            "pos_cluster": df.loc[y_true.index, "pos_cluster"].values,
+            "error": np.round(y_true.values - y_pred, 1),
+            "true": np.round(y_true.values, 1),
+            "pred": np.round(y_pred, 1),
+        }
+    )
+    write_atomic(holdout_path(lbl), lambda tmp: table.to_parquet(tmp, index=False))
+    return table
+
+
+def holdout_predictions(lbl: str) -> dict:
+    """Hold-out-Tabelle einer Position samt vorberechneten Such-Indizes.
+
+    Die Tabelle wird aus dem Artefakt gelesen bzw. einmalig berechnet. Dazu gibt es
+    die Sortierreihenfolgen nach Abweichung (für die Top-5-Diagramme) und den
+    Spieler-Index für die Einzelanalyse.
+    """
+    key = (lbl, model_hash(lbl), dataset_hash(ML_DATASET))
+    with _ARTIFACT_LOCK:
+        entry = _HOLDOUT.get(key)
+    if entry is not None:
+        return entry
+
+    try:
+        table = pd.read_parquet(holdout_path(lbl))
+    except (OSError, ValueError):
+        # fehlendes oder beschädigtes Artefakt (ArrowInvalid ist ein ValueError): neu berechnen
+        table = build_holdout(lbl)
+
+    index = build_player_index(table)
+    error = table["error"].to_numpy()
+    entry = {
+        "table": table,
+        "player_index": index,
+        "players": index["players"],
+        # stabile Sortierung: bei Gleichstand wie nlargest/nsmallest die erste Zeile
+        "desc": np.argsort(-error, kind="stable"),
+        "asc": np.argsort(error, kind="stable"),
+    }
+    with _ARTIFACT_LOCK:
+        # ältere Modell- oder Datenstände dieser Position verwerfen
+        for stale in [k for k in _HOLDOUT if k[0] == lbl and k != key]:
+            del _HOLDOUT[stale]
+        _HOLDOUT[key] = entry
+    return entry
+
+
+def holdout_player(lbl: str, player: str) -> pd.Series:
+    """Hold-out-Zeile eines Spielers"""
+    entry = holdout_predictions(lbl)
+    start, _ = entry["player_index"]["ranges"][player]
+    # stabile Sortierung: erste Zeile des Spielers in der Tabelle
+    return entry["table"].iloc[entry["player_index"]["order"][start]]
+
+
+def holdout_extremes(lbl: str, n: int = 5):
+    """Die n größten und n kleinsten Abweichungen"""
+    entry = holdout_predictions(lbl)
+    table = entry["table"]
+    return table.iloc[entry["desc"][:n]], table.iloc[entry["asc"][:n]]
+
+
+
+# ------------------------------------------------------------------
+# Antwortflächen (Was-wäre-wenn)
+# ------------------------------------------------------------------
+def surface_path(lbl: str) -> Path:
+    return CACHE_DIR / f"surface_{lbl}_{model_hash(lbl)[:12]}_{dataset_hash(ML_DATASET)[:12]}.npz"
+
+
+def build_response_surface(lbl: str) -> dict:
+    """Raster je Eingabewert einer Position und Rangfolge nach Einfluss.
+
+    Der Einfluss ist die Spannweite der Vorhersage, wenn nur dieser Wert über sein Raster
+    läuft und alle übrigen auf dem Positions-Median bleiben (Draft-Werte: Median der
+    gedrafteten Spieler); dafür genügt ein ``predict``-Aufruf. Gespeichert werden nur
+    Raster und Reihenfolge – die Kurven selbst berechnet ``sensitivity_curves`` an der
+    Eingabe des Nutzers.
+    """
+    df = load_dataset(ML_DATASET)
+    df_pos = df[df["pos_cluster"] == lbl]
+    drafted = df_pos[df_pos["draft_flag"] == 1]
+
+    base = {col: df_pos[col].median() for col in ["height", "weight"] + COMBINE_COLS}
+    base["draft_number"] = drafted["draft_number"].median()
+    base["draft_age"] = drafted["draft_age"].median()
+
+    grids = {}
+    for feature in SURFACE_FEATURES:
+        if feature == "draft_number":
+            grids[feature] = np.linspace(1, 60, SURFACE_POINTS)
+        else:
+            source = drafted if feature == "draft_age" else df_pos
+            grids[feature] = np.unique(source[feature].dropna().quantile(
+                np.linspace(0.01, 0.99, SURFACE_POINTS)).to_numpy())
+        grids[feature] = grids[feature].astype(np.float32)
+
+    rows = []
+    for feature, grid in grids.items():
+        for value in grid:
+            rows.append({**base, feature: value})
+    with span("model.surface", position=lbl, rows=len(rows)):
+        preds = get_model(lbl).predict(build_features(pd.DataFrame(rows)))
+
+    spread, start = {}, 0
+    for feature, grid in grids.items():
+        spread[feature] = np.ptp(preds[start:start + len(grid)]) if len(grid) else 0
+        start += len(grid)
+    order = sorted(grids, key=spread.get, reverse=True)
+
+    def save(tmp):
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, features=np.array(order), **{f"{f}_x": grids[f] for f in order})
+
+    write_atomic(surface_path(lbl), save)
+    return {"features": order, "grids": {f: grids[f] for f in order}}
+
+
+def response_surface(lbl: str) -> dict:
+    """Raster und Rangfolge einer Position (aus dem Artefakt oder einmalig berechnet)"""
+    key = (lbl, model_hash(lbl), dataset_hash(ML_DATASET))
+    with _ARTIFACT_LOCK:
+        surface = _SURFACES.get(key)
+    if surface is not None:
+        return surface
+
+    try:
+        with np.load(surface_path(lbl)) as data:
+            order = [str(f) for f in data["features"]]
+            surface = {"features": order, "grids": {f: data[f"{f}_x"] for f in order}}
+    except (BadZipFile, OSError, KeyError, ValueError):
+        # fehlendes, unvollständiges oder fremdes Artefakt: neu berechnen
+        surface = build_response_surface(lbl)
+    with _ARTIFACT_LOCK:
+        # ältere Modell- oder Datenstände dieser Position verwerfen
+        for stale in [k for k in _SURFACES if k[0] == lbl and k != key]:
+            del _SURFACES[stale]
+        _SURFACES[key] = surface
+    return surface
+
+
+def sensitivity_curves(lbl: str, user_values: dict, top: int = 4) -> list:
+    """Sensitivitätskurven an der aktuellen Eingabe.
+
+    Je Kurve wird ein Wert über das Raster der Antwortfläche variiert, alle übrigen
+    bleiben auf der Eingabe des Nutzers; der eigene Wert gehört zum Raster, die Kurve
+    läuft also durch die Vorhersage von ``predict_one``. Auswahl und Reihenfolge der
+    Eingaben stammen aus der Antwortfläche. Alle Kurven entstehen mit einem ``predict``-
+    Aufruf und werden pro Eingabe im LRU-Cache gehalten. Liefert ``(feature, x, y, user_x)``;
+    fehlende Werte werden übersprungen.
+    """
+    key = (lbl, model_hash(lbl), tuple(sorted((k, _normalize(v)) for k, v in user_values.items())), top)
+    with _PREDICTION_LOCK:
+        if key in _CURVES:
+            _CURVES.move_to_end(key)
+            return _CURVES[key]
+
+    surface = response_surface(lbl)
+    grids = []
+    for feature in surface["features"]:
+        user_x = user_values.get(feature)
+        grid = surface["grids"][feature]
+        if user_x is None or pd.isna(user_x) or grid.size == 0:
+            continue
+        grids.append((feature, np.union1d(grid.astype(np.float64), [float(user_x)]), float(user_x)))
+        if len(grids) == top:
+            break
+
+    rows = [{**user_values, feature: value} for feature, x, _ in grids for value in x]
+    result = []
+    if rows:
+        with span("model.sensitivity", position=lbl, rows=len(rows)):
+            preds = get_model(lbl).predict(build_features(pd.DataFrame(rows)))
+        start = 0
+        for feature, x, user_x in grids:
+            result.append((feature, x, preds[start:start + len(x)], user_x))
+            start += len(x)
+
+    with _PREDICTION_LOCK:
+        _CURVES[key] = result
+        while len(_CURVES) > CURVE_CACHE_SIZE:
+            _CURVES.popitem(last=False)
+    return result
+
+
+if __name__ == "__main__":
+    # Offline-Schritt: python model_utils.py
+    for lbl in available_positions():
+        start = time.perf_counter()
+        table = build_holdout(lbl)
+        build_response_surface(lbl)
+        print(f"✅ {lbl}: {len(table)} Vorhersagen -> {holdout_path(lbl)}, "
+              f"Antwortfläche -> {surface_path(lbl)} ({time.perf_counter() - start:.2f}s)")
@@ -0,0 +1,18 @@
+"""Seitennavigation für den Serverbetrieb (``streamlit run app.py``).
+
+Jeder Seitenlauf wird hier als ``page.run``-Span gemessen – auch wenn er durch
+``st.stop``, einen Rerun oder einen Fehler abbricht. Die Seiten selbst bleiben unverändert.
+"""
+from pathlib import Path
+
+import streamlit as st
+
+from perf_utils import page_span
+
+ROOT = Path(__file__).parent
+PAGES = [st.Page(ROOT / "1_🏀_Homepage.py", default=True)]
+PAGES += [st.Page(path) for path in sorted((ROOT / "pages").glob("*.py"))]
+
+page = st.navigation(PAGES)
+with page_span(page.title):
+    page.run()
@@ -1,8 +1,8 @@
 import streamlit as st
 from style_utils import set_app_config, load_custom_css
+from asset_utils import image_data_uri, optimized_image
 from streamlit_mermaid import st_mermaid
 from pathlib import Path
-import base64
 
 set_app_config(
     title="Unser Team",
@@ -17,14 +17,9 @@ st.markdown('<div class="centered-title">Unser Team</div>',
 
 
 
-# Funktion: Lokales Bild in Base64 konvertieren
-def img_to_base64(img_path):
-    with open(img_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
-
-# Icons laden und konvertieren
-linkedin_icon = img_to_base64("images/linkedin.png")
-github_icon = img_to_base64("images/github.png")
+# Icons als data-URI (einmal pro Prozess kodiert)
+linkedin_icon = image_data_uri("images/linkedin.png", width=20)
+github_icon = image_data_uri("images/github.png", width=20)
 
 # --- Team Abschnitt ---
 st.markdown("""
@@ -35,15 +30,15 @@ st.markdown("""
 
 col1, col2 = st.columns([1, 5])
 with col1:
-    st.image("images/Isabelle.png", width=200)
+    st.image(optimized_image("images/Isabelle.png", 200), width=200)
 with col2:
     st.markdown(f"""
     <strong>Isabelle Haehl</strong>
     <a href="https://www.linkedin.com/in/isabelle-haehl" target="_blank">
-        <img src="data:image/png;base64,{linkedin_icon}" width="20" style="margin-left:6px;">
+        <img src="{linkedin_icon}" width="20" style="margin-left:6px;">
     </a>
     <a href="https://github.com/isabellehaehl" target="_blank">
-        <img src="data:image/png;base64,{github_icon}" width="20" style="margin-left:6px;">
+        <img src="{github_icon}" width="20" style="margin-left:6px;">
     </a><br>
     Data Scientist
     <p> </p>
@@ -54,15 +49,15 @@ with col2:
 
 col3, col4 = st.columns([1, 5])
 with col3:
-    st.image("images/Florian.jpg", width=200)
+    st.image(optimized_image("images/Florian.jpg", 200), width=200)
 with col4:
     st.markdown(f"""
     <strong>Florian Löb</strong>
     <a href="https://www.linkedin.com/in/florian-loeb" target="_blank">
-        <img src="data:image/png;base64,{linkedin_icon}" width="20" style="margin-left:6px;">
+        <img src="{linkedin_icon}" width="20" style="margin-left:6px;">
     </a>
     <a href="https://github.com/florian-loeb" target="_blank">
-        <img src="data:image/png;base64,{github_icon}" width="20" style="margin-left:6px;">
+        <img src="{github_icon}" width="20" style="margin-left:6px;">
     </a><br>
     Data Scientist  
     <p> </p>
@@ -72,15 +67,15 @@ with col4:
 
 col5, col6 = st.columns([1, 5])
 with col5:
-    st.image("images/Anna.jpeg", width=200)
+    st.image(optimized_image("images/Anna.jpeg", 200), width=200)
 with col6:
     st.markdown(f"""
     <strong>Anna Muravyeva</strong>
     <a href="https://www.linkedin.com/in/anna-muravyeva-3602b2374" target="_blank">
-        <img src="data:image/png;base64,{linkedin_icon}" width="20" style="margin-left:6px;">
+        <img src="{linkedin_icon}" width="20" style="margin-left:6px;">
     </a>
     <a href="https://github.com/Anna88Mur" target="_blank">
-        <img src="data:image/png;base64,{github_icon}" width="20" style="margin-left:6px;">
+        <img src="{github_icon}" width="20" style="margin-left:6px;">
     </a><br>
     Data Analyst  
     <p> </p>
@@ -1,12 +1,15 @@
 import streamlit as st
-from style_utils import set_app_config, load_custom_css, apply_dark_theme
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import seaborn as sns
-import plotly.graph_objects as go
-import numpy as np
-from scipy.cluster.hierarchy import linkage, leaves_list
+from style_utils import set_app_config, load_custom_css, keep_widget_state, section_nav
+from data_utils import dataset_hash, load_dataset, player_names
+from analysis_utils import (
+    CORR_DROP_COLS, clustered_correlation, draft_filter_index, filter_mask, first_matches, slice_correlation,
+    three_point_cube, three_point_player, value_mask
+)
+from import_utils import lazy_import
+from plot_utils import corr_heatmap, draft_boxplot, figure_bytes, full_corr_heatmap
+
+# seaborn erst laden, wenn ein Diagramm nicht aus dem Cache kommt
+sns = lazy_import("seaborn")
 
 
 set_app_config(
@@ -21,10 +24,39 @@ st.markdown('<div class="centered-title">Explorative Analyse</div>',
             unsafe_allow_html=True)
 
 
-tab1, tab2, tab3 = st.tabs(
-    ["📈 Korrelationen", "📊 Draft-Analysen", "🔍 Dreipunktewurf-Analysen"])
+# Datenquellen
+numerical_path = "data/numerical_data.csv"
+draft_path = "data/data_analyse_60_height_draft.csv"
+nba_path = "data/NBA_Dataset.csv"
+
+
+def _draft_options(col):
+    return sorted(load_dataset(draft_path)[col].unique())
+
+
+def _sum_mp_bounds():
+    sum_mp = load_dataset(draft_path)['sum_mp']
+    return int(sum_mp.min()), int(sum_mp.max())
+
 
-with tab1:
+# Filter bleiben erhalten, während ein anderer Abschnitt angezeigt wird
+# (datenabhängige Standardwerte werden erst beim ersten Bedarf berechnet)
+keep_widget_state({
+    "eda_corr_cols": lambda: clustered_correlation(numerical_path, CORR_DROP_COLS).columns.tolist(),
+    "eda_d_group": lambda: list(load_dataset(draft_path)['d_group'].unique()),
+    "eda_pos": lambda: _draft_options('pos_cluster_calc'),
+    "eda_draft_number": lambda: _draft_options('draft_number'),
+    "eda_sum_mp": _sum_mp_bounds,
+    "eda_player": "",
+    "eda_show_fg3a": False,
+    "eda_normalized": False,
+})
+
+# Nur der gewählte Abschnitt wird berechnet und gerendert
+SECTIONS = ["📈 Korrelationen", "📊 Draft-Analysen", "🔍 Dreipunktewurf-Analysen"]
+section = section_nav(SECTIONS, key="eda_section")
+
+if section == SECTIONS[0]:
     # st.header("📈 Korrelationen")
     st.markdown("""
     <div style='padding: 1rem; background-color: #1f2633 ; border-radius: 0.5rem;'>
@@ -32,69 +64,22 @@ with tab1:
     </div>
     """, unsafe_allow_html=True)
 
-    # Daten laden
-    numerical_data = pd.read_csv("data/numerical_data.csv")
-
-    # Spalten entfernen
-    drop_cols = ['stl_pct_calc', 'allstar_pct_calc', 'avg_age', 'stand_jump',
-                 'max_jump', 'court_sprint', 'end_age', 'lane_agility',
-                 'bench_press', 'fg_pct_calc', 'usg_pct_calc', 'orb_pct_calc',
-                 'drb_pct_calc', 'net_rating_calc', 'all_star_total',
-                 'score_guard', 'score_wing', 'score_big', 'score_nach_cluster',
-                 'success_score']
-
-    corr_data = numerical_data.drop(columns=drop_cols).corr()
-
-
-# Variante 3
-
-    def cluster_corr_matrix(corr_matrix):
-        """Korrelationsmatrix nach Clustern sortieren"""
-        # Berechnung der Distanzen zwischen den Merkmalen
-        row_linkage = linkage(corr_matrix, method='ward', metric='euclidean')
-        col_linkage = linkage(corr_matrix.T, method='ward', metric='euclidean')
-
-        # Ermitteln der Reihenfolge der Zeilen und Spalten
-        row_order = leaves_list(row_linkage)
-        col_order = leaves_list(col_linkage)
-
-        # Sortieren der Matrix
-        clustered = corr_matrix.iloc[row_order, col_order]
-        return clustered
-
-    clustered_corr = cluster_corr_matrix(corr_data)
-    clustered_corr = clustered_corr.iloc[::-1]
-
-    # 2. Erstellung einer interaktiven, geclusterten Heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=clustered_corr.values,
-        x=clustered_corr.columns.tolist(),
-        y=clustered_corr.index.tolist(),
-        zmin=-1,
-        zmax=1,
-        colorscale='RdBu',
-        colorbar=dict(title='Korrelation'),
-        hoverongaps=False,
-        text=np.round(clustered_corr.values, 2),
-        texttemplate="%{text}",
-    ))
-
-    # 3. Layout-Anpassung
-    fig.update_layout(
-        title='Korrelationsmatrix mit hierarchischem Clustering',
-        width=800,
-        height=700,
-        xaxis_title="Merkmale",
-        yaxis_title="Merkmale",
-        xaxis=dict(tickangle=45, tickfont=dict(size=10)),
-        yaxis=dict(tickfont=dict(size=10)),
-        margin=dict(l=100, r=50, b=150, t=50),
-    )
+    # Spalten entfernen (gemeinsam mit dem Warm-up definiert)
+    drop_cols = CORR_DROP_COLS
 
-    # 4. Hinzufügen von Annotationen zur besseren Lesbarkeit
-    fig.update_traces(
-        hovertemplate="<b>%{y}</b> vs <b>%{x}</b><br>Korrelation: %{z:.2f}<extra></extra>"
-    )
+    # Geclusterte Korrelationsmatrix (einmal pro Datenstand und drop_cols berechnet)
+    clustered_full = clustered_correlation(numerical_path, drop_cols)
+
+    all_cols = clustered_full.columns.tolist()
+    with st.expander("⚙️ Merkmale auswählen"):
+        selected_cols = st.multiselect("Merkmale:", options=all_cols, key="eda_corr_cols")
+
+    if len(selected_cols) == len(all_cols):
+        # Vollständige Heatmap wird geteilt und nicht neu aufgebaut
+        fig = full_corr_heatmap(numerical_path, drop_cols)
+    else:
+        # Teilmenge: Ausschnitt der gecachten Matrix statt Neuberechnung
+        fig = corr_heatmap(slice_correlation(clustered_full, selected_cols))
 
     st.plotly_chart(fig, use_container_width=True)
 
@@ -112,7 +97,7 @@ with tab1:
     """, unsafe_allow_html=True)
 
 
-with tab2:
+elif section == SECTIONS[1]:
     # st.header("📊 Draft-Analysen")
 
     with st.expander("ℹ️ Kurze Information zum Draftverfahren"):
@@ -123,32 +108,12 @@ with tab2:
         """)
 
     # Daten laden
-    draft = pd.read_csv("data/data_analyse_60_height_draft.csv")
-
-    # Plot erzeugen
-    apply_dark_theme()
-    fig, ax = plt.subplots(figsize=(8, 5))
-    sns.boxplot(data=draft, x='d_group',
-                y='success_score',
-                palette='Set2',
-                boxprops=dict(edgecolor='white', linewidth=1.5),
-                whiskerprops=dict(color='white', linewidth=1.5),
-                capprops=dict(color='white', linewidth=1.5),
-                flierprops=dict(marker='o', markersize=4,
-                                markerfacecolor='none', markeredgecolor='white'),
-                medianprops=dict(color='white', linewidth=2),
-                ax=ax)
-    ax.set_title('Karriere-Erfolg nach Draftgruppe')
-    ax.set_xlabel('Draftgruppe')
-    ax.set_ylabel('Success Score')
-    ax.grid(True, axis='y')
-
-    plt.tight_layout()
-
-    # 👉 In Streamlit anzeigen
+    draft = load_dataset(draft_path)
+
+    # 👉 In Streamlit anzeigen (einmal pro Datenstand gerendert)
     col1, col2, col3 = st.columns([1, 3, 1])
     with col2:
-        st.pyplot(fig)
+        st.image(draft_boxplot(draft_path), width="stretch")
 
     # Filter-Widgets
     st.subheader("🔍 Filter")
@@ -158,7 +123,7 @@ with tab2:
         d_group_filter = st.multiselect(
             "Draft-Gruppen (d_group):",
             options=sorted(draft['d_group'].unique()),
-            default=draft['d_group'].unique()
+            key="eda_d_group"
         )
 
         st.markdown(
@@ -171,14 +136,14 @@ with tab2:
         pos_filter = st.multiselect(
             "Positionsgruppen (pos_cluster_calc):",
             options=sorted(draft['pos_cluster_calc'].unique()),
-            default=sorted(draft['pos_cluster_calc'].unique())
+            key="eda_pos"
         )
 
     with col3:
         draft_number_filter = st.multiselect("Draft-Nummern (draft_number):",
                                              options=sorted(
                                                  draft['draft_number'].unique()),
-                                             default=sorted(draft['draft_number'].unique()))
+                                             key="eda_draft_number")
 
         st.markdown(
             "<i>Hinweis: Wenn du <b>61</b> auswählst, siehst du Spieler, die <b>nicht gedraftet</b> wurden.</i>",
@@ -191,32 +156,32 @@ with tab2:
             "Spielzeitbereich (sum_mp):",
             min_value=min_sum,
             max_value=max_sum,
-            value=(min_sum, max_sum),
-            step=100
+            step=100,
+            key="eda_sum_mp"
         )
 
-    # Filter anwenden
-    gefiltert = draft[
-        (draft['d_group'].isin(d_group_filter)) &
-        (draft['pos_cluster_calc'].isin(pos_filter)) &
-        (draft['draft_number'].isin(draft_number_filter)) &
-        (draft['sum_mp'].between(sum_mp_range[0], sum_mp_range[1]))
-    ]
+    # Filter anwenden (vorberechnete Indizes statt Masken über den ganzen Frame)
+    draft_index = draft_filter_index(draft_path)
+    gefiltert = filter_mask(
+        draft_index,
+        {
+            'd_group': d_group_filter,
+            'pos_cluster_calc': pos_filter,
+            'draft_number': draft_number_filter,
+        },
+        sum_mp_range
+    )
+    top_cols = ['player', 'pos_cluster_calc', 'sum_mp', 'all_star_total',
+                'draft_number', 'success_score', 'avg_score_d_number',
+                'score_d_number_diff', 'career_years']
 
     # Top 10
-    top10_up = gefiltert[['player', 'pos_cluster_calc', 'sum_mp', 'all_star_total',
-                         'draft_number', 'success_score', 'avg_score_d_number',
-                          'score_d_number_diff', 'career_years'
-                          ]].sort_values(by='score_d_number_diff', ascending=False).head(10)
+    top10_up = draft.iloc[first_matches(draft_index["order_desc"], gefiltert, 10)][top_cols]
 
     # Underperformer (nur gedraftete Spieler)
-    nur_gedraftet = gefiltert[gefiltert['draft_number'] != 61]
+    nur_gedraftet = gefiltert & ~value_mask(draft_index, 'draft_number', [61])
 
-    top10_down = nur_gedraftet[[
-        'player', 'pos_cluster_calc', 'sum_mp', 'all_star_total',
-        'draft_number', 'success_score', 'avg_score_d_number',
-        'score_d_number_diff', 'career_years'
-    ]].sort_values(by='score_d_number_diff', ascending=True).head(10)
+    top10_down = draft.iloc[first_matches(draft_index["order_asc"], nur_gedraftet, 10)][top_cols]
 
     st.subheader("🏅 Top 10 Überperformer (inkl. Undrafted)")
     st.dataframe(
@@ -254,7 +219,7 @@ with tab2:
     """, unsafe_allow_html=True)
 
 
-with tab3:
+elif section == SECTIONS[2]:
     # st.header("🔍 Dreipunktewurf-Analysen")
 
     st.markdown("""
@@ -272,90 +237,71 @@ with tab3:
 
     # Daten laden
     # merged_with_all_star_60 = pd.read_csv("data/merged_with_all_star_60.csv")
-    NBA_3_Punkte = pd.read_csv("data/NBA_Dataset.csv")
-
-    basisjahr=1982
     #  --- Ligadurchschnitt ---
     # - fg3_pct- - Zeigt, wie sich die Trefferquote bei Dreipunktwürfen verbessert hat
     # - fg3a_per_fga_pct - - Zeigt, wie stark der Anteil der Dreierwürfe am gesamten Wurfvolumen gestiegen ist.
 
-    fg3_by_season = NBA_3_Punkte.groupby("season")["fg3_pct"].mean().reset_index()
-    fg3a_share_by_season = NBA_3_Punkte.groupby("season")["fg3a_per_fga_pct"].mean().reset_index()
+    # Vorberechnete Saison-Aggregate (Basisjahr 1982 = 100 bereits angewendet)
+    cube = three_point_cube(nba_path)
+    fg3_by_season = fg3a_share_by_season = cube["league"]
 
 
 
     # Spieler-Dropdown
-    player_list = [""] + sorted(
-        NBA_3_Punkte["player"].dropna().unique().tolist())
+    player_list = [""] + player_names(nba_path)
     player_name = st.selectbox(
         "🔍 Spieler wählen",
         options=player_list,
-        index=0
+        key="eda_player"
     )
     # Checkboxen
-    zeige_fg3a = st.checkbox("📈 Anteil der Dreierwürfe anzeigen (FG3A/FGA%)", value=False)
-    normalisiert = st.checkbox("📊 Normalisierung (Basisjahr 1982 = 100)", value=False)
+    zeige_fg3a = st.checkbox("📈 Anteil der Dreierwürfe anzeigen (FG3A/FGA%)", key="eda_show_fg3a")
+    normalisiert = st.checkbox("📊 Normalisierung (Basisjahr 1982 = 100)", key="eda_normalized")
 
     # Gefilterte Daten für den Spieler (wenn vorhanden)
     if player_name:
-        player_df = NBA_3_Punkte[NBA_3_Punkte['player'] == player_name]
-        player_fg3_by_season = player_df.groupby("season")["fg3_pct"].mean().reset_index()
-        player_fg3a_by_season = player_df.groupby("season")["fg3a_per_fga_pct"].mean().reset_index()
+        player_fg3_by_season = player_fg3a_by_season = three_point_player(nba_path, player_name)
 
 
     # Normalisierung, falls aktiviert
     if normalisiert:
-        fg3_norm = fg3_by_season.copy()
-        fg3a_norm = fg3a_share_by_season.copy()
-        
-        fg3_basiswert = fg3_norm[fg3_norm["season"] == basisjahr]["fg3_pct"].values[0]
-        fg3a_basiswert = fg3a_norm[fg3a_norm["season"] == basisjahr]["fg3a_per_fga_pct"].values[0]
-        
-        fg3_norm["fg3_norm"] = fg3_norm["fg3_pct"] / fg3_basiswert * 100
-        fg3a_norm["fg3a_norm"] = fg3a_norm["fg3a_per_fga_pct"] / fg3a_basiswert * 100
-        
+        fg3_norm = fg3a_norm = fg3_by_season
         if player_name:
-            player_fg3_norm = player_fg3_by_season.copy()
-            player_fg3a_norm = player_fg3a_by_season.copy()
-            player_fg3_norm["fg3_norm"] = player_fg3_norm["fg3_pct"] / fg3_basiswert * 100
-            player_fg3a_norm["fg3a_norm"] = player_fg3a_norm["fg3a_per_fga_pct"] / fg3a_basiswert * 100
-
-    apply_dark_theme()
-
-    # Plot erstellen
-    fig, ax = plt.subplots(figsize=(12, 6))
+            player_fg3_norm = player_fg3a_norm = player_fg3_by_season
 
-    if normalisiert:
-        sns.lineplot(data=fg3_norm, x="season", y="fg3_norm", marker="o", linewidth=2, label="FG3% (normiert)", ax=ax)
-        if zeige_fg3a:
-            sns.lineplot(data=fg3a_norm, x="season", y="fg3a_norm", marker="o", linewidth=2, label="FG3A/FGA% (normiert)", ax=ax)
-        if player_name:
-            sns.lineplot(data=player_fg3_norm, x="season", y="fg3_norm", marker="o", linewidth=2, label=f"{player_name} FG3% (normiert)", ax=ax)
+    # Plot erstellen (je Spieler/Ansicht einmal gerendert)
+    def render_three_point(ax):
+        if normalisiert:
+            sns.lineplot(data=fg3_norm, x="season", y="fg3_norm", marker="o", linewidth=2, label="FG3% (normiert)", ax=ax)
             if zeige_fg3a:
-                sns.lineplot(data=player_fg3a_norm, x="season", y="fg3a_norm", marker="o", linewidth=2, label=f"{player_name} FG3A/FGA% (normiert)", ax=ax)
-        ax.axhline(100, color="gray", linestyle="--", linewidth=1)
-        ax.set_ylabel("Index (Basisjahr = 100)")
-    else:
-        sns.lineplot(data=fg3_by_season, x="season", y="fg3_pct", marker="o", linewidth=2, label="Ligadurchschnitt FG3%", ax=ax)
-        if zeige_fg3a:
-            sns.lineplot(data=fg3a_share_by_season, x="season", y="fg3a_per_fga_pct", marker="o", linewidth=2, label="Ligadurchschnitt FG3A/FGA%", ax=ax)
-        if player_name:
-            sns.lineplot(data=player_fg3_by_season, x="season", y="fg3_pct", marker="o", linewidth=2, label=f"{player_name} FG3%", ax=ax)
+                sns.lineplot(data=fg3a_norm, x="season", y="fg3a_norm", marker="o", linewidth=2, label="FG3A/FGA% (normiert)", ax=ax)
+            if player_name:
+                sns.lineplot(data=player_fg3_norm, x="season", y="fg3_norm", marker="o", linewidth=2, label=f"{player_name} FG3% (normiert)", ax=ax)
+                if zeige_fg3a:
+                    sns.lineplot(data=player_fg3a_norm, x="season", y="fg3a_norm", marker="o", linewidth=2, label=f"{player_name} FG3A/FGA% (normiert)", ax=ax)
+            ax.axhline(100, color="gray", linestyle="--", linewidth=1)
+            ax.set_ylabel("Index (Basisjahr = 100)")
+        else:
+            sns.lineplot(data=fg3_by_season, x="season", y="fg3_pct", marker="o", linewidth=2, label="Ligadurchschnitt FG3%", ax=ax)
             if zeige_fg3a:
-                sns.lineplot(data=player_fg3a_by_season, x="season", y="fg3a_per_fga_pct", marker="o", linewidth=2, label=f"{player_name} FG3A/FGA%", ax=ax)
-        ax.set_ylabel("FG3% / FG3A-FG Anteil")
-
-    
-    # Plot anpassen
-    ax.set_title("Historische Entwicklung der Dreierwürfe – Liga vs. Spieler")
-    ax.set_xlabel("Saisonjahr")
-    ax.set_ylabel("FG3%")
-    ax.grid(True)
-    ax.legend()
-    plt.tight_layout()
+                sns.lineplot(data=fg3a_share_by_season, x="season", y="fg3a_per_fga_pct", marker="o", linewidth=2, label="Ligadurchschnitt FG3A/FGA%", ax=ax)
+            if player_name:
+                sns.lineplot(data=player_fg3_by_season, x="season", y="fg3_pct", marker="o", linewidth=2, label=f"{player_name} FG3%", ax=ax)
+                if zeige_fg3a:
+                    sns.lineplot(data=player_fg3a_by_season, x="season", y="fg3a_per_fga_pct", marker="o", linewidth=2, label=f"{player_name} FG3A/FGA%", ax=ax)
+            ax.set_ylabel("FG3% / FG3A-FG Anteil")
+
+        # Plot anpassen
+        ax.set_title("Historische Entwicklung der Dreierwürfe – Liga vs. Spieler")
+        ax.set_xlabel("Saisonjahr")
+        ax.set_ylabel("FG3%")
+        ax.grid(True)
+        ax.legend()
+        ax.figure.tight_layout()
 
     # Plot anzeigen
-    st.pyplot(fig)
+    st.image(figure_bytes("three_point_history", render_three_point, dataset_hash(nba_path), (12, 6),
+                          params=(player_name, zeige_fg3a, normalisiert)), width="stretch")
 
     st.markdown("""
         <div style='padding: 1rem; background-color: #1f2633; border-radius: 0.5rem; color: white;'>
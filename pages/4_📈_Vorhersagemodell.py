@@ -1,14 +1,23 @@
 import streamlit as st
-from style_utils import set_app_config, load_custom_css
+from style_utils import set_app_config, load_custom_css, keep_widget_state, section_nav
+from perf_utils import traced
+from data_utils import load_dataset
+from feature_utils import bmi, build_features
+from analysis_utils import feature_bounds, percentile_of, position_percentile_index, value_range
+from model_utils import (
+    ML_DATASET, TARGETS, available_positions, holdout_extremes, holdout_player, holdout_predictions, predict_one,
+    sensitivity_curves
+)
+from plot_utils import FEATURE_CATEGORIES, FEATURE_DECIMALS, FEATURE_TITLES, feature_grid
+from import_utils import lazy_import
 import pandas as pd
 import numpy as np
-import joblib
-import altair as alt
-from pathlib import Path
-import re
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-from scipy.stats import percentileofscore
+
+# Diagramm-Bibliotheken erst laden, wenn ein Abschnitt sie braucht
+alt = lazy_import("altair")
+go = lazy_import("plotly.graph_objects")
+plotly_subplots = lazy_import("plotly.subplots")
+
 
 set_app_config(
     title="ML",
@@ -22,41 +31,75 @@ st.markdown('<div class="centered-title">Vorhersagemodell</div>',
             unsafe_allow_html=True)
 
 # ------------------------------------------------------------------
-# 1) Load trained models (cached)
+# 1) Trained models (loaded lazily per position, shared across sessions)
 # ------------------------------------------------------------------
-@st.cache_data(show_spinner=False)
-def load_models():
-    """Load pre-trained models for Big, Guard and Wing."""
-    return {
-        lbl: joblib.load(f"data/best_model_{lbl}.pkl")
-        for lbl in ("Big", "Guard", "Wing")
-        if Path(f"data/best_model_{lbl}.pkl").exists()
-    }
-
-models = load_models()
-if not models:
+positions = available_positions()
+if not positions:
     st.error("❌ Keine Modelle gefunden. Bitte Training durchführen.")
     st.stop()
 
 # Dataframe ---------------------------------------------------------------
-df = pd.read_pickle("data/1_dataset_ML.pkl")
+df = load_dataset(ML_DATASET)
+# Sortierte Werte je Position für Perzentile und Min/Max
+percentiles = position_percentile_index()
 
-# Mapping & feature list ------------------------------------------------------
-targets = {"Big": "score_big", "Guard": "score_guard", "Wing": "score_wing"}
-feature_cols = [
-    "height", "weight", "bmi", "draft_flag", "draft_age", "draft_number", "draft_group",
-    "stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"
-]
+# Mapping ---------------------------------------------------------------------
+targets = TARGETS
 
 # ------------------------------------------------------------------
-# 2) Tabs – Success Score + Analysen
+# 2) Abschnitte – Success Score + Analysen (nur der gewählte läuft)
 # ------------------------------------------------------------------
-TABS = st.tabs([
-    "Success Score", "Spielerwerte", "Busts & Steals"
-])
+SECTIONS = ["Success Score", "Spielerwerte", "Busts & Steals"]
+
+# Eingaben bleiben erhalten, während ein anderer Abschnitt angezeigt wird
+INPUT_DEFAULTS = {
+    "ml_position": positions[0],
+    "ml_height": 200,
+    "ml_weight": 100,
+    "ml_drafted": False,
+    "ml_draft_num": 1,
+    "ml_draft_age": 21,
+    "ml_stand_jump": 29.5,
+    "ml_max_jump": 35.0,
+    "ml_court_sprint": 3.25,
+    "ml_lane_agility": 11.3,
+    "ml_bench_press": 10,
+}
+keep_widget_state(INPUT_DEFAULTS)
+if st.session_state["ml_position"] not in positions:
+    st.session_state["ml_position"] = positions[0]
+
+section = section_nav(SECTIONS, key="ml_section")
+
+
+def read_inputs() -> dict:
+    """Aktuelle Rohwerte der Eingabemaske (auch wenn sie gerade nicht angezeigt wird)"""
+    drafted = st.session_state["ml_drafted"]
+    return {
+        "height": st.session_state["ml_height"],
+        "weight": st.session_state["ml_weight"],
+        # undrafted: Platzhalter setzt build_features
+        "draft_number": st.session_state["ml_draft_num"] if drafted else None,
+        "draft_age": st.session_state["ml_draft_age"] if drafted else None,
+        "stand_jump": st.session_state["ml_stand_jump"],
+        "max_jump": st.session_state["ml_max_jump"],
+        "court_sprint": st.session_state["ml_court_sprint"],
+        "lane_agility": st.session_state["ml_lane_agility"],
+        "bench_press": st.session_state["ml_bench_press"],
+    }
+
+
+position = st.session_state["ml_position"]
+# Gleiche Feature-Ableitung (BMI, Draft-Gruppe, Undrafted-Platzhalter) wie im Batch-Scoring
+X_user = build_features(pd.DataFrame([read_inputs()]))
+user_input = X_user.to_dict("list")
+
 
 # 2a – Success Score (Spieler‑Input) -----------------------------------------
-with TABS[0]:
+# Eigenes Fragment: Eingaben rerunnen nur Formular und Vorhersage, nicht die ganze Seite
+@st.fragment
+@traced("page.fragment", page="Vorhersagemodell", fragment="success_score")
+def success_score_section():
     col_input, col_space, col_balken = st.columns([13, 1, 6])
 
     with col_input:
@@ -67,49 +110,27 @@ with TABS[0]:
         # --- Physische Attribute ---
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            position = st.selectbox("Position", list(models.keys()))
+            st.selectbox("Position", positions, key="ml_position")
         with col2:
-            HEIGHT = st.slider("Größe (cm)", 160, 230, 200)
-            DRAFT_AGE = 0  # wird unten gesetzt, falls Spieler drafted
+            st.slider("Größe (cm)", 160, 230, key="ml_height")
         with col3:
-            WEIGHT = st.slider("Gewicht (kg)", 60, 150, 100)
-            DRAFT_NUM = 0
+            st.slider("Gewicht (kg)", 60, 150, key="ml_weight")
         with col4:
-            BMI_val = WEIGHT / ((HEIGHT / 100) ** 2)
+            BMI_val = bmi(st.session_state["ml_weight"], st.session_state["ml_height"])
             st.markdown(f"BMI (kg/m²): {BMI_val:.1f}")
             st.caption("ℹ️ BMI wird automatisch berechnet.")
         st.markdown("---")
 
         # --- Draft Infos ---
         st.markdown("#### 🏆 Draft Infos")
-        DRAFT_FLAG = st.checkbox("Drafted?", value=False)
-        DRAFT_GRP = 7  # Standard: undrafted
+        st.checkbox("Drafted?", key="ml_drafted")
 
-        if DRAFT_FLAG:
+        if st.session_state["ml_drafted"]:
             col_d1, col_d2 = st.columns(2)
             with col_d1:
-                DRAFT_NUM = st.slider("Draft Nummer", 1, 60, 1)
+                st.slider("Draft Nummer", 1, 60, key="ml_draft_num")
             with col_d2:
-                DRAFT_AGE = st.slider("Draft Alter", 18, 30, 21)
-
-            # Automatische Gruppenzuordnung
-            if 1 <= DRAFT_NUM <= 10:
-                DRAFT_GRP = 1
-            elif 11 <= DRAFT_NUM <= 20:
-                DRAFT_GRP = 2
-            elif 21 <= DRAFT_NUM <= 30:
-                DRAFT_GRP = 3
-            elif 31 <= DRAFT_NUM <= 40:
-                DRAFT_GRP = 4
-            elif 41 <= DRAFT_NUM <= 50:
-                DRAFT_GRP = 5
-            else:
-                DRAFT_GRP = 6
-        else:
-            # Spieler undrafted
-            DRAFT_NUM = 61
-            DRAFT_AGE = 0
-            DRAFT_GRP = 7
+                st.slider("Draft Alter", 18, 30, key="ml_draft_age")
 
         st.caption("ℹ️ Draft-Gruppe wird automatisch aus der Draft Number bestimmt (1=Top10, 2=11–20, …, 7=Undrafted).")
         st.markdown("---")
@@ -118,15 +139,15 @@ with TABS[0]:
         st.markdown("#### 🏋️ Combine Werte")
         c1, c2, c3, c4, c5 = st.columns(5)
         with c1:
-            SJUMP = st.number_input("Standing Jump (cm)", 0.0, 50.0, 29.5, step=0.1, format="%.1f")
+            st.number_input("Standing Jump (cm)", 0.0, 50.0, step=0.1, format="%.1f", key="ml_stand_jump")
         with c2:
-            MJUMP = st.number_input("Max Jump (cm)", 0.0, 50.0, 35.0, step=0.1, format="%.1f")
+            st.number_input("Max Jump (cm)", 0.0, 50.0, step=0.1, format="%.1f", key="ml_max_jump")
         with c3:
-            SPRINT = st.number_input("Court Sprint (s)", 2.0, 4.0, 3.25, step=0.01, format="%.2f")
+            st.number_input("Court Sprint (s)", 2.0, 4.0, step=0.01, format="%.2f", key="ml_court_sprint")
         with c4:
-            AGILITY = st.number_input("Lane Agility (s)", 8.0, 15.0, 11.3, step=0.01, format="%.2f")
+            st.number_input("Lane Agility (s)", 8.0, 15.0, step=0.01, format="%.2f", key="ml_lane_agility")
         with c5:
-            BENCH = st.number_input("Bench Press (Wdh)", 0, 30, 10)
+            st.number_input("Bench Press (Wdh)", 0, 30, key="ml_bench_press")
         # --- Styling für Button ---
         st.markdown("""
             <style>
@@ -143,146 +164,144 @@ with TABS[0]:
         with col_btn2:
             predict_btn = st.button("🔮 Score vorhersagen")
 
-    # -----------------------------
-    # Prediction Input Dictionary
-    # -----------------------------
-    user_input = {
-        "height": [HEIGHT],
-        "weight": [WEIGHT],
-        "bmi": [round(BMI_val, 1)],
-        "draft_age": [DRAFT_AGE],
-        "draft_number": [DRAFT_NUM],
-        "draft_group": [DRAFT_GRP],
-        "draft_flag": [1 if DRAFT_FLAG else 0],
-        "stand_jump": [round(SJUMP, 1)],
-        "max_jump": [round(MJUMP, 1)],
-        "court_sprint": [round(SPRINT, 2)],
-        "lane_agility": [round(AGILITY, 2)],
-        "bench_press": [round(BENCH, 0)]
-    }
+    position = st.session_state["ml_position"]
+    raw_values = read_inputs()
+    X_user = build_features(pd.DataFrame([raw_values]))
 
-# ------------------------------------------------------------------
-# 3) Prediction
-# ------------------------------------------------------------------
-user_input = {
-    "height": [HEIGHT], "weight": [WEIGHT], "bmi": [round(BMI_val, 2)],
-    "draft_age": [DRAFT_AGE], "draft_number": [DRAFT_NUM], "draft_group": [DRAFT_GRP],
-    "stand_jump": [SJUMP], "max_jump": [MJUMP], "court_sprint": [SPRINT],
-    "lane_agility": [AGILITY], "bench_press": [BENCH], "draft_flag": [1 if DRAFT_FLAG else 0]
-}
+    # ------------------------------------------------------------------
+    # 3) Prediction
+    # ------------------------------------------------------------------
+    with col_balken:
+        st.markdown(f"### 📈 Predicted Success Score ({position}s)")
+        if predict_btn:
 
-with col_balken:
-    st.markdown(f"### 📈 Predicted Success Score ({position}s)")
-    if predict_btn:
-
-        # Berechne prediction
-        X_user = pd.DataFrame(user_input)
-        score_pred = models[position].predict(X_user)[0]
-
-        score_col = targets.get(position)
+            # Berechne prediction
+            score_pred = predict_one(position, X_user)
 
-        percentile = None
-        if score_col and not df.empty:
-            scores_pos = df[df["pos_cluster"] == position][score_col].dropna()
-            if not scores_pos.empty:
-                percentile = percentileofscore(scores_pos, score_pred, kind='weak')
+            score_col = targets.get(position)
+            percentile = percentile_of(percentiles, (position, score_col), score_pred)
 
-        # Anzeige der Prediction als Text über dem Diagramm
-        st.markdown(
-            f"<div style='text-align:center; font-size:3rem; color: white;'>{score_pred:.1f}</div>",
-            unsafe_allow_html=True,
-        )
-
-        df_filtered = df[df["pos_cluster"] == position]
-        score_col = targets.get(position)
+            # Anzeige der Prediction als Text über dem Diagramm
+            st.markdown(
+                f"<div style='text-align:center; font-size:3rem; color: white;'>{score_pred:.1f}</div>",
+                unsafe_allow_html=True,
+            )
 
-        if score_col and not df_filtered.empty:
-            min_score = df_filtered[score_col].min()
-            max_score = df_filtered[score_col].max()
-        else:
-            min_score = 0
-            max_score = 100
-
-        # Hintergrundbalken (Score-Bereich)
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=["Score"],
-            y=[max_score - min_score],
-            base=min_score,
-            width=0.4,
-            marker=dict(color="gray", opacity=0.3),
-            hoverinfo="skip",
-            showlegend=False
-        ))
-
-        # Rote Linie quer über den Balken
-        fig.add_shape(
-            type="line",
-            x0=-0.5,
-            x1=0.5,
-            y0=score_pred,
-            y1=score_pred,
-            line=dict(color="#FF4B4B", width=3)
-        )
-
-        # Textlabel direkt an der Linie
-        fig.add_annotation(
-            x=0,
-            y=score_pred,
-            text=f"{score_pred:.1f} ({percentile:.0f}. Perzentil)",
-            showarrow=False,
-            font=dict(color="white", size=15),
-            yshift=10
-        )
-
-        # Min-Score Annotation
-        fig.add_annotation(
-            x=0,
-            y=min_score,
-            text=f"Min: {min_score:.1f}",
-            showarrow=False,
-            font=dict(color="white", size=15),
-            yshift=-20
-        )
+            score_range = value_range(percentiles, (position, score_col))
+            if score_range is not None:
+                min_score, max_score = score_range
+            else:
+                min_score = 0
+                max_score = 100
+
+            # Hintergrundbalken (Score-Bereich)
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                x=["Score"],
+                y=[max_score - min_score],
+                base=min_score,
+                width=0.4,
+                marker=dict(color="gray", opacity=0.3),
+                hoverinfo="skip",
+                showlegend=False
+            ))
+
+            # Rote Linie quer über den Balken
+            fig.add_shape(
+                type="line",
+                x0=-0.5,
+                x1=0.5,
+                y0=score_pred,
+                y1=score_pred,
+                line=dict(color="#FF4B4B", width=3)
+            )
+
+            # Textlabel direkt an der Linie
+            fig.add_annotation(
+                x=0,
+                y=score_pred,
+                text=f"{score_pred:.1f} ({percentile:.0f}. Perzentil)",
+                showarrow=False,
+                font=dict(color="white", size=15),
+                yshift=10
+            )
+
+            # Min-Score Annotation
+            fig.add_annotation(
+                x=0,
+                y=min_score,
+                text=f"Min: {min_score:.1f}",
+                showarrow=False,
+                font=dict(color="white", size=15),
+                yshift=-20
+            )
+
+            # Max-Score Annotation
+            fig.add_annotation(
+                x=0,
+                y=max_score,
+                text=f"Max: {max_score:.1f}",
+                showarrow=False,
+                font=dict(color="white", size=15),
+                yshift=10
+            )
+
+            # Layout – schwarz & weiß
+            fig.update_layout(
+                height=650,
+                plot_bgcolor="#0E1117",
+                paper_bgcolor="#0E1117",
+                margin=dict(l=10, r=10, t=30, b=30),
+                yaxis=dict(
+                    range=[min_score - 5, max_score + 5],
+                    tickfont=dict(color="white"),
+                    title=dict(
+                        text="Success Score",
+                        font=dict(color="white", size=20)
+                    )
+                ),
+                xaxis=dict(
+                    showticklabels=False
+                ),
+                showlegend=False
+            )
 
-        # Max-Score Annotation
-        fig.add_annotation(
-            x=0,
-            y=max_score,
-            text=f"Max: {max_score:.1f}",
-            showarrow=False,
-            font=dict(color="white", size=15),
-            yshift=10
-        )
+            st.plotly_chart(fig, use_container_width=True)
 
-        # Layout – schwarz & weiß
-        fig.update_layout(
-            height=650,
-            plot_bgcolor="#0E1117",
-            paper_bgcolor="#0E1117",
-            margin=dict(l=10, r=10, t=30, b=30),
-            yaxis=dict(
-                range=[min_score - 5, max_score + 5],
-                tickfont=dict(color="white"),
-                title=dict(
-                    text="Success Score",
-                    font=dict(color="white", size=20)
+    # Was-wäre-wenn: Sensitivitätskurven an der aktuellen Eingabe ----------------
+    if predict_btn:
+        with st.expander("🔬 Was-wäre-wenn: Einfluss der wichtigsten Eingaben", expanded=True):
+            st.caption("ℹ️ Modellvorhersagen, wenn jeweils ein Wert variiert wird und alle übrigen Eingaben unverändert bleiben.")
+            curves = sensitivity_curves(position, raw_values)
+            if curves:
+                fig = plotly_subplots.make_subplots(rows=1, cols=len(curves),
+                                    subplot_titles=[FEATURE_TITLES.get(f, f) for f, *_ in curves])
+                for i, (feature, x, y, user_x) in enumerate(curves, start=1):
+                    fig.add_trace(go.Scatter(x=x, y=y, mode="lines", line=dict(color="#f4a261", width=2),
+                                             hovertemplate="%{x:.1f} → %{y:.1f}<extra></extra>"),
+                                  row=1, col=i)
+                    fig.add_trace(go.Scatter(x=[user_x], y=[score_pred], mode="markers",
+                                             marker=dict(color="#FF4B4B", size=10), hoverinfo="skip"),
+                                  row=1, col=i)
+                fig.update_layout(
+                    height=300,
+                    plot_bgcolor="#0E1117",
+                    paper_bgcolor="#0E1117",
+                    margin=dict(l=10, r=10, t=40, b=30),
+                    showlegend=False
                 )
-            ),
-            xaxis=dict(
-                showticklabels=False
-            ),
-            showlegend=False
-        )
+                st.plotly_chart(fig, use_container_width=True)
 
-        st.plotly_chart(fig, use_container_width=True)
+
+if section == "Success Score":
+    success_score_section()
 
 # ------------------------------------------------------------------
-# 4) Analysis Tabs ------------------------------------------------------------
+# 4) Analyse-Abschnitte -------------------------------------------------------
 # ------------------------------------------------------------------
 
 # 4a – Spielerwerte -----------------------------------------------------
-with TABS[1]:
+elif section == "Spielerwerte":
     # Relativer Vergleich der Metriken
     st.write(f"### 📊 Spielerwerte im Positionsvergleich mit {position}s")
     st.info("ℹ️ Vergleich der Attribute eines Spielers mit den Min- und Max-Werten seiner Positionsgruppe (grauer Balken) und Markierung seines eigenen Werts (rote Linie) inkl. Perzentil.")
@@ -290,193 +309,157 @@ with TABS[1]:
     # Spalten, die nicht angezeigt werden sollen
     exclude_features = ["draft_group", "draft_flag"]
 
-    # Rundungsregeln pro Feature
-    rounding_rules = {
-        "height": 0,
-        "weight": 0,
-        "draft_age": 0,
-        "draft_number": 0,
-        "bench_press": 0,
-        "bmi": 1,
-        "max_jump": 1,
-        "stand_jump": 1,
-        "court_sprint": 2,
-        "lane_agility": 2
-        }
-
-    df_pos = df[df["pos_cluster"] == position]
-    
-    # --- Kategorien ---
-    categories = {
-        "🏀 Physische Attribute": ["height", "weight", "bmi"],
-        "🏆 Draft Infos": ["draft_age", "draft_number"],
-        "🏋️ Combine Werte": ["stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"]
-    }
-
-    # --- Plotbeschriftungen ---
-    title_map = {
-        "height": "Größe (cm)",
-        "weight": "Gewicht (kg)",
-        "bmi": "BMI (kg/m²)",
-        "draft_age": "Draft Alter",
-        "draft_number": "Draft Nummer",
-        "stand_jump": "Standing Jump (cm)",
-        "max_jump": "Max Jump (cm)",
-        "court_sprint": "Court Sprint (s)",
-        "lane_agility": "Lane Agility (s)",
-        "bench_press": "Bench Press (Wdh)"
-    }
+    def user_marker(feature):
+        """Wert des Spielers und sein Perzentil (bei Zeiten/Draft Nummer umgedreht)"""
+        user_val = float(np.ravel(user_input[feature])[0])
+        if feature == "draft_number" and user_val == 0:
+            user_val = 61
+        percentile = percentile_of(percentiles, (position, feature), user_val)
+        if percentile is not None and feature in ["draft_number", "court_sprint", "lane_agility"]:
+            percentile = 100 - percentile
+        return user_val, percentile
+
+    def show_marker(feature):
+        """Undrafted: keine Markierung bei Draft Alter und Draft Nummer"""
+        return not (feature in ["draft_number", "draft_age"] and user_input["draft_flag"] == [0])
+
+    compact = st.toggle("Kompakte Ansicht (ein Diagramm)", value=True, key="ml_compact")
+
+    if compact:
+        # Balken je Position einmal pro Datenstand aufbauen, hier nur Spielerwerte ergänzen
+        base_fig, axis_refs = feature_grid(position)
+        shapes, annotations = [], list(base_fig["layout"]["annotations"])
+        for feature, (xref, yref) in axis_refs.items():
+            if not show_marker(feature):
+                continue
+            user_val, percentile = user_marker(feature)
+            decimals = FEATURE_DECIMALS.get(feature, 2)
+            perc_text = f"{user_val:.{decimals}f}"
+            if percentile is not None:
+                perc_text += f" ({percentile:.0f}%)"
+            shapes.append(dict(type="line", x0=-0.5, x1=0.5, y0=user_val, y1=user_val, xref=xref, yref=yref,
+                               line=dict(color="#FF4B4B", width=3)))
+            annotations.append(dict(x=0, y=user_val, text=perc_text, showarrow=False, xref=xref, yref=yref,
+                                    font=dict(color="white", size=15), yshift=10))
+        fig = {"data": base_fig["data"],
+               "layout": {**base_fig["layout"], "shapes": shapes, "annotations": annotations}}
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        for cat_name, cat_features in FEATURE_CATEGORIES.items():
+            # Filter nur Features, die existieren
+            cat_features = [f for f in cat_features if f in df.columns and f in user_input.keys()]
+
+            if not cat_features:
+                continue
+
+            # Miniüberschrift
+            st.markdown(f"#### {cat_name}")
+
+            # Zeilenweise Darstellung mit max 3 Plots
+            cols_per_row = 3
+            rows = (len(cat_features) + cols_per_row - 1) // cols_per_row
+
+            for r in range(rows):
+                cols = st.columns(cols_per_row)
+                for i, feature in enumerate(cat_features[r*cols_per_row:(r+1)*cols_per_row]):
+                    user_val, percentile = user_marker(feature)
+                    min_score, max_score = feature_bounds(percentiles, position, feature)
+                    if max_score is None:
+                        max_score = user_val
+
+                    decimals = FEATURE_DECIMALS.get(feature, 2)
+                    min_fmt = f"{min_score:.{decimals}f}"
+                    max_fmt = f"{max_score:.{decimals}f}"
+                    user_fmt = f"{user_val:.{decimals}f}"
+
+                    fig = go.Figure()
+
+                    fig.add_trace(go.Bar(
+                        x=[feature],
+                        y=[max_score - min_score],
+                        base=min_score,
+                        width=0.4,
+                        marker=dict(color="gray", opacity=0.3),
+                        hoverinfo="skip",
+                        showlegend=False
+                    ))
+
+                    if show_marker(feature):
+                        fig.add_shape(
+                            type="line",
+                            x0=-0.5,
+                            x1=0.5,
+                            y0=user_val,
+                            y1=user_val,
+                            line=dict(color="#FF4B4B", width=3)
+                        )
+
+                        perc_text = f"{user_fmt}"
+                        if percentile is not None:
+                            perc_text += f" ({percentile:.0f}%)"
+
+                        fig.add_annotation(
+                            x=0,
+                            y=user_val,
+                            text=perc_text,
+                            showarrow=False,
+                            font=dict(color="white", size=15),
+                            yshift=10
+                        )
 
-    for cat_name, cat_features in categories.items():
-        # Filter nur Features, die existieren
-        cat_features = [f for f in cat_features if f in df_pos.columns and f in user_input.keys()]
-
-        if not cat_features:
-            continue
-
-        # Miniüberschrift
-        st.markdown(f"#### {cat_name}")
-
-        # Zeilenweise Darstellung mit max 3 Plots
-        cols_per_row = 3
-        rows = (len(cat_features) + cols_per_row - 1) // cols_per_row
-
-        for r in range(rows):
-            cols = st.columns(cols_per_row)
-            for i, feature in enumerate(cat_features[r*cols_per_row:(r+1)*cols_per_row]):
-                user_val = float(np.ravel(user_input[feature])[0]) if isinstance(user_input[feature], (list, np.ndarray)) else float(user_input[feature])
-                data_series = df_pos[feature].dropna()
-
-                # --- Sonderfälle ---
-                if feature == "draft_age":
-                    data_series = data_series[data_series > 0]
-                    min_score = max(18, data_series.min()) if not data_series.empty else 18
-                else:
-                    min_score = data_series.min() if not data_series.empty else 0
-
-                if feature == "draft_number":
-                    if user_val == 0:
-                        user_val = 61
-                    data_series = data_series.apply(lambda x: 61 if x == 0 else x)
-                    max_score = 60
-                else:
-                    max_score = data_series.max() if not data_series.empty else user_val
-
-                decimals = rounding_rules.get(feature, 2)
-                min_fmt = f"{min_score:.{decimals}f}"
-                max_fmt = f"{max_score:.{decimals}f}"
-                user_fmt = f"{user_val:.{decimals}f}"
-
-                percentile = None
-                if not data_series.empty:
-                    if feature in ["draft_number", "court_sprint", "lane_agility"]:
-                        perc = percentileofscore(data_series, user_val, kind='weak')
-                        percentile = 100 - perc
-                    else:
-                        percentile = percentileofscore(data_series, user_val, kind='weak')
-
-                fig = go.Figure()
-
-                fig.add_trace(go.Bar(
-                    x=[feature],
-                    y=[max_score - min_score],
-                    base=min_score,
-                    width=0.4,
-                    marker=dict(color="gray", opacity=0.3),
-                    hoverinfo="skip",
-                    showlegend=False
-                ))
-
-                if not (feature in ["draft_number", "draft_age"] and user_input["draft_flag"] == [0]):
-                    fig.add_shape(
-                        type="line",
-                        x0=-0.5,
-                        x1=0.5,
-                        y0=user_val,
-                        y1=user_val,
-                        line=dict(color="#FF4B4B", width=3)
+                    fig.add_annotation(
+                        x=0,
+                        y=min_score,
+                        text=f"Min: {min_fmt}",
+                        showarrow=False,
+                        font=dict(color="white", size=15),
+                        yshift=-20
                     )
-
-                    perc_text = f"{user_fmt}"
-                    if percentile is not None:
-                        perc_text += f" ({percentile:.0f}%)"
-
                     fig.add_annotation(
                         x=0,
-                        y=user_val,
-                        text=perc_text,
+                        y=max_score,
+                        text=f"Max: {max_fmt}",
                         showarrow=False,
                         font=dict(color="white", size=15),
                         yshift=10
                     )
 
-                fig.add_annotation(
-                    x=0,
-                    y=min_score,
-                    text=f"Min: {min_fmt}",
-                    showarrow=False,
-                    font=dict(color="white", size=15),
-                    yshift=-20
-                )
-                fig.add_annotation(
-                    x=0,
-                    y=max_score,
-                    text=f"Max: {max_fmt}",
-                    showarrow=False,
-                    font=dict(color="white", size=15),
-                    yshift=10
-                )
-
-                fig.update_layout(
-                    height=300,
-                    plot_bgcolor="#0E1117",
-                    paper_bgcolor="#0E1117",
-                    margin=dict(l=120, r=120, t=100, b=20),
-                    yaxis=dict(
-                        range=[min_score - (0.05 * abs(max_score)), max_score + (0.05 * abs(max_score))],
-                        tickfont=dict(color="white"),
-                        title=None
-                    ),
-                    xaxis=dict(showticklabels=False),
-                    title=dict(
-                        text=title_map.get(feature, feature.replace("_", " ").title()),
-                        font=dict(color="white", size=20),
-                        x=0.5,                 # zentriert (0=links, 0.5=Mitte, 1=rechts)
-                        xanchor="center",      # Ankerpunkt in der Mitte
-                        yanchor="top"
-                    ),
-                    showlegend=False
-                )
+                    fig.update_layout(
+                        height=300,
+                        plot_bgcolor="#0E1117",
+                        paper_bgcolor="#0E1117",
+                        margin=dict(l=120, r=120, t=100, b=20),
+                        yaxis=dict(
+                            range=[min_score - (0.05 * abs(max_score)), max_score + (0.05 * abs(max_score))],
+                            tickfont=dict(color="white"),
+                            title=None
+                        ),
+                        xaxis=dict(showticklabels=False),
+                        title=dict(
+                            text=FEATURE_TITLES.get(feature, feature.replace("_", " ").title()),
+                            font=dict(color="white", size=20),
+                            x=0.5,                 # zentriert (0=links, 0.5=Mitte, 1=rechts)
+                            xanchor="center",      # Ankerpunkt in der Mitte
+                            yanchor="top"
+                        ),
+                        showlegend=False
+                    )
 
-                cols[i].plotly_chart(fig, use_container_width=True)
-        st.markdown("---")  # Trennlinie nach jeder Kategorie
+                    cols[i].plotly_chart(fig, use_container_width=True)
+            st.markdown("---")  # Trennlinie nach jeder Kategorie
 
 # 4b – Busts & Steals ---------------------------------------------------------
-with TABS[2]:
+elif section == "Busts & Steals":
     st.write("### ⚖️ Bust or Steal?")
     st.info("ℹ️ Vergleich des vorhergesagten und tatsächlichen Success Scores für einen ausgewählten Spieler und Übersicht der Top Busts und Steals.")
 
-    col = targets[position]
-    y_true  = df[col].dropna()
-    X_hold  = df.loc[y_true.index, feature_cols]
-    players = df.loc[y_true.index, "player"]
-
-    y_pred  = models[position].predict(X_hold)
-    errors  = np.round(y_true.values - y_pred, 1)
-
-    df_err  = pd.DataFrame(
-        {
-            "player": players.values,
-            "error": errors,
-            "true": np.round(y_true.values, 1),
-            "pred": np.round(y_pred, 1),
-        }
-    )
+    # Vorberechnete Hold-out-Vorhersagen (einmal pro Modellstand)
+    holdout = holdout_predictions(position)
 
     # Manuelle Spielerauswahl
     st.write("#### 🎯 Individuelle Spieleranalyse") 
 
-    player_list = ["--- Spieler wählen ---"] + sorted(df_err["player"].unique())
+    player_list = ["--- Spieler wählen ---"] + holdout["players"]
     selected_player = st.selectbox(
         label="",
         options=player_list,
@@ -485,13 +468,13 @@ with TABS[2]:
     )
 
     if selected_player != "--- Spieler wählen ---":
-        player_data = df_err[df_err["player"] == selected_player].iloc[0]
-        player_true = player_data["true"]
-        player_pred = player_data["pred"]
-        player_error = player_data["error"]
+        player_data = holdout_player(position, selected_player)
+        player_true = float(player_data["true"])
+        player_pred = float(player_data["pred"])
+        player_error = float(player_data["error"])
 
         # Positionscluster des ausgewählten Spielers
-        selected_cluster = df[df["player"] == selected_player]["pos_cluster"].iloc[0]
+        selected_cluster = player_data["pos_cluster"]
         score_col = targets.get(selected_cluster)
 
         # Cluster-Werte nur für Spieler dieser Position
@@ -601,8 +584,7 @@ with TABS[2]:
 
 
     # Top 5 Charts
-    busts  = df_err.nlargest(5, "error")
-    steals = df_err.nsmallest(5, "error")
+    busts, steals = holdout_extremes(position, 5)
 
     st.write("#### 💎 Top 5 Steals")
     bust_chart = (
@@ -628,4 +610,4 @@ with TABS[2]:
         )
         .properties(height=300)
     )
-    st.altair_chart(steal_chart, use_container_width=True)
\ No newline at end of file
+    st.altair_chart(steal_chart, use_container_width=True)
@@ -1,8 +1,7 @@
 import streamlit as st
-from style_utils import set_app_config, load_custom_css,apply_dark_theme
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from style_utils import set_app_config, load_custom_css
+from analysis_utils import mvp_tables
+from plot_utils import mvp_age_boxplot, mvp_age_histogram, mvp_award_histogram, mvp_efficiency, mvp_season_chart
 
 set_app_config(
     title="MVPs vs. Nicht-MVPs",
@@ -30,13 +29,13 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# --- CSV einlesen ---
-df = pd.read_csv("data/NBA_Dataset.csv")
-
-df = df.reset_index()
+# --- Vorberechnete MVP-Tabellen (einmal pro Datenstand) ---
+nba_path = "data/NBA_Dataset.csv"
+mvp = mvp_tables(nba_path)
+# Diagramme werden je Datenstand einmal gerendert und als PNG wiederverwendet (plot_utils)
 
 # --- MVP-Spieler herausfiltern ---
-df_mvp = df[df['award_share'] > 0]
+df_mvp = mvp["candidates"]
 
 
 # --- Boxplot: Alter der MVP-Spieler ---
@@ -47,21 +46,7 @@ with col1:
 
     st.header("📈 Boxplot: Alter der MVP-Kandidaten", anchor=False)
 
-    apply_dark_theme()
-    fig1, ax1 = plt.subplots(figsize=(7, 4))
-    sns.boxplot(data=df_mvp, x='age',
-                color='skyblue',
-                boxprops=dict(edgecolor='white', linewidth=1.5),
-                whiskerprops=dict(color='white', linewidth=1.5),
-                capprops=dict(color='white', linewidth=1.5),
-                flierprops=dict(marker='o', markersize=4,
-                                markerfacecolor='none', markeredgecolor='white'),
-                medianprops=dict(color='white', linewidth=2),
-                ax=ax1)
-    ax1.set_title('Alter der Spieler mit MVP-Stimmen (Boxplot)', fontsize=12)
-    ax1.set_xlabel('Alter')
-    ax1.grid(True)
-    st.pyplot(fig1)
+    st.image(mvp_age_boxplot(nba_path), width="stretch")
 
 st.markdown("""
     <div style='padding: 1rem; background-color: #1f2633 ; border-radius: 0.5rem;'>
@@ -91,43 +76,13 @@ with col2:
     # --- Histogramm: Alter der MVP-Spieler ---
     st.header("📊 Histogramm: Alter der MVP-Kandidaten", anchor=False)
 
-    apply_dark_theme()
-    fig2, ax2 = plt.subplots(figsize=(7, 4))
-    sns.histplot(df_mvp['age'],
-                 bins=15,
-                 kde=True,
-                 color='purple',
-                 edgecolor='white',
-                 linewidth=1.5,
-                 alpha=1.0,
-                 ax=ax2)
-
-    ax2.set_title(
-        'Verteilung des Alters der Spieler mit MVP-Stimmen', fontsize=12)
-    ax2.set_xlabel('Alter')
-    ax2.set_ylabel('Anzahl der Spieler')
-    ax2.grid(True, alpha=0.3)
-    st.pyplot(fig2)
+    st.image(mvp_age_histogram(nba_path), width="stretch")
 
 
 # 📉 Histogramm der award_share-Werte (Stimmenanteil)
 st.header("🏆 Verteilung MVP-Stimmenanteil", anchor="verteilung-mvp-stimmen")
 
-apply_dark_theme()
-fig_award, ax_award = plt.subplots(figsize=(10, 5))
-sns.histplot(df_mvp['award_share'],
-             bins=30,
-             kde=True,
-             color='green',
-             edgecolor='white',
-             linewidth=1.5,
-             alpha=1.0,
-             ax=ax_award)
-ax_award.set_title('Verteilung der MVP-Stimmen (nur Spieler mit Stimmen)')
-ax_award.set_xlabel('MVP-Stimmenanteil (award_share)')
-ax_award.set_ylabel('Anzahl der Spieler')
-ax_award.grid(True, alpha=0.3)
-st.pyplot(fig_award)
+st.image(mvp_award_histogram(nba_path), width="stretch")
 
 with st.expander("ℹ️ Interpretation der Verteilung der MVP-Stimmenanteile"):
     st.markdown(f"""
@@ -149,67 +104,13 @@ with st.expander("ℹ️ Interpretation der Verteilung der MVP-Stimmenanteile"):
 """, unsafe_allow_html=True)
 
 
-df["is_mvp"] = df["award_share"] > 0
-available_seasons = sorted(df["season"].dropna().unique())
+available_seasons = mvp["seasons"]
 
 st.header("📅 Durchschnittswerte pro Saison")
 selected_season = st.selectbox("Wähle eine Saison:", available_seasons)
 
-# Daten für diese Saison
-season_df = df[df["season"] == selected_season]
-
-# Mittelwerte berechnen
-metrics = ["pts_per_g", "ast_per_g", "trb_per_g", "per", "ws"]
-season_df = season_df.dropna(subset=metrics)
-
-season_df = season_df[season_df["mp"] >= 60]
-
-avg_values = season_df.groupby("is_mvp")[metrics].mean().reset_index()
-avg_values["MVP Status"] = avg_values["is_mvp"].map(
-    {True: "MVP-Kandidaten", False: "Andere Spieler"})
-
-
-# Melt für Seaborn
-# melt() macht aus einer Matrix eine Liste – superpraktisch für Visualisierung oder lange Tabellen.
-melted = avg_values.melt(
-    id_vars="MVP Status", value_vars=metrics, var_name="Stat", value_name="Wert")
-
-metric_labels = {
-    "pts_per_g": "Punkte/Spiel",
-    "ast_per_g": "Assists/Spiel",
-    "trb_per_g": "Rebounds/Spiel",
-    "per": "Effizienzrating (PER)",
-    "ws": "Gewinnanteil (WS)"
-}
-
-melted["Stat"] = melted["Stat"].map(metric_labels)
-
-# Plotten
-apply_dark_theme()
-fig, ax = plt.subplots(figsize=(10, 5))
-
-sns.barplot(data=melted, x="Stat", y="Wert", hue="MVP Status", ax=ax)
-ax.set_title(
-    f"Durchschnittliche Leistungskennzahlen von MVP-Kandidaten und anderen Spielern ({selected_season})")
-
-for p in ax.patches:
-    height = p.get_height()
-    if height > 0:
-        ax.annotate(
-            f"{height:.1f}",
-            (p.get_x() + p.get_width() / 2., height),
-            ha='center',
-            va='center',
-            xytext=(0, 5),
-            textcoords='offset points'
-        )
-
-plt.xticks(rotation=15)
-ax.set_xlabel("Leistungsmetriken")
-ax.set_ylabel("Durchschnittswert")
-
-
-st.pyplot(fig)
+# Mittelwerte dieser Saison (je Saison beim ersten Aufruf bzw. im Warm-up gerendert)
+st.image(mvp_season_chart(nba_path, selected_season), width="stretch")
 
 st.markdown(f"""
 
@@ -226,27 +127,11 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 
-# --- Nur nötige Spalten und keine NaNs ---
-effizienz_df = df[['is_mvp', 'ts_pct', 'efg_pct']].dropna()
-
-# --- Gruppieren nach MVP vs. Nicht-MVP und Mittelwerte berechnen ---
-effizienz_means = effizienz_df.groupby(
-    'is_mvp')[['ts_pct', 'efg_pct']].mean().T
-effizienz_means.columns = [
-    'Nicht-MVPs', 'MVP-Kandidaten'] if False in effizienz_means.columns else ['MVP-Kandidaten']
-
 # --- Visualisierung ---
 st.header("🎯Effizienzvergleich: MVPs vs. Nicht-MVPs")
 
-apply_dark_theme()
-fig, ax = plt.subplots(figsize=(7, 4))
-effizienz_means.plot(kind='bar', ax=ax, color=['#2a9d8f', '#f4a261'])
-ax.set_title('Durchschnittliche Effizienzmetriken (TS% und eFG%)', fontsize=14)
-ax.set_ylabel('Wert')
-ax.set_xlabel('Effizienz-Metrik')
-ax.grid(axis='y')
-ax.legend(title='Spielertyp', loc='lower right')
-st.pyplot(fig)
+# Mittelwerte nach MVP vs. Nicht-MVP (vorberechnet)
+st.image(mvp_efficiency(nba_path), width="stretch")
 
 # --- Interpretation ---
 st.markdown(f"""
@@ -0,0 +1,210 @@
+"""Leichtgewichtige Instrumentierung mit benannten Spans.
+
+Aktiviert über die Umgebungsvariable ``NBA_PERF=1``; ohne sie liefert ``span`` einen
+geteilten No-op-Kontext. Jeder Span misst Wandzeit, CPU-Zeit (Thread) und den
+Spitzen-Speicherzuwachs laut tracemalloc und wird als JSON-Zeile nach
+``NBA_PERF_FILE`` (Standard: ``data/cache/perf.jsonl``) geschrieben.
+
+Der Speicherwert ist prozessweit: tracemalloc kennt nur eine Spitze für alle Threads.
+Sie wird nur zurückgesetzt, wenn kein anderer Span offen ist; laufen Spans mehrerer
+Sessions gleichzeitig, enthält ``peak_kb`` auch deren Allokationen (obere Schranke).
+
+Bei aktivierter Messung läuft tracemalloc ab dem ersten Span mit und verlangsamt
+speicherintensive Abschnitte spürbar – Messwerte daher nur relativ vergleichen. Mit
+``NBA_PERF_MEMORY=0`` werden nur Zeiten erfasst (``peak_kb`` bleibt 0), etwa für
+Latenzmessungen wie ``benchmarks/fragment_latency.py``.
+
+Prometheus-Textformat aus einer Logdatei:
+    python perf_utils.py data/cache/perf.jsonl
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+ENABLED = os.environ.get("NBA_PERF", "").lower() in ("1", "true", "yes", "on")
+MEMORY = os.environ.get("NBA_PERF_MEMORY", "1").lower() not in ("0", "false", "no", "off")
+PERF_FILE = Path(os.environ.get("NBA_PERF_FILE", "data/cache/perf.jsonl"))
+
+_FIELDS = ("ts", "span", "wall_ms", "cpu_ms", "peak_kb")
+
+
+def _empty_totals():
+    return {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_bytes": 0}
+
+
+# Aggregate je (Span-Name, Labels): Anzahl, Summen und maximaler Speicherzuwachs
+_TOTALS = defaultdict(_empty_totals)
+_LOCK = threading.Lock()
+# Anzahl offener Spans im ganzen Prozess (tracemalloc-Spitze ist prozessweit)
+_MEMORY = {"open": 0}
+_MEMORY_LOCK = threading.Lock()
+
+
+class _NoopSpan:
+    """Ersatz, wenn die Instrumentierung ausgeschaltet ist"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def start(self):
+        return self
+
+    def stop(self):
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """Misst einen benannten Abschnitt; als Kontextmanager oder über ``start``/``stop``"""
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def start(self):
+        self.memory_start = None
+        if MEMORY:
+            self._start_memory()
+        self.cpu_start = time.thread_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def _start_memory(self):
+        with _MEMORY_LOCK:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # Nur zurücksetzen, wenn kein anderer (auch verschachtelter) Span misst
+            if _MEMORY["open"] == 0:
+                tracemalloc.reset_peak()
+            _MEMORY["open"] += 1
+            self.memory_start, _ = tracemalloc.get_traced_memory()
+
+    def stop(self):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.thread_time() - self.cpu_start
+        peak_bytes = 0
+        if self.memory_start is not None:
+            with _MEMORY_LOCK:
+                _, peak = tracemalloc.get_traced_memory()
+                _MEMORY["open"] = max(_MEMORY["open"] - 1, 0)
+            peak_bytes = max(peak - self.memory_start, 0)
+
+        record = {
+            "ts": time.time(),
+            "span": self.name,
+            **self.labels,
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "peak_kb": round(peak_bytes / 1024, 1),
+        }
+        _record(record)
+        return record
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # abgebrochene Läufe (st.stop, Rerun, Fehler) werden mit Grund erfasst
+            self.labels["exit"] = exc_type.__name__
+        self.stop()
+        return False
+
+
+def _accumulate(aggregates, record):
+    """Zählt einen Span-Datensatz in die Aggregate ein"""
+    labels = tuple((k, str(v)) for k, v in record.items() if k not in _FIELDS)
+    entry = aggregates[(record["span"], labels)]
+    entry["count"] += 1
+    entry["wall_seconds"] += record["wall_ms"] / 1000
+    entry["cpu_seconds"] += record["cpu_ms"] / 1000
+    entry["peak_bytes"] = max(entry["peak_bytes"], int(record["peak_kb"] * 1024))
+
+
+def _record(record):
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _LOCK:
+        _accumulate(_TOTALS, record)
+        try:
+            PERF_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(PERF_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+
+def span(name, **labels):
+    """Benannter Messabschnitt, z. B. ``with span("data.load", path=path): ...``"""
+    if not ENABLED:
+        return _NOOP
+    return Span(name, labels)
+
+
+def page_span(page):
+    """Span für einen kompletten Seitenlauf (siehe ``navigation.py``)"""
+    return span("page.run", page=page)
+
+
+def traced(name, **labels):
+    """Dekorator: jeder Aufruf der Funktion läuft in einem eigenen Span"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def totals() -> dict:
+    """Aggregierte Messwerte dieses Prozesses je (Span, Labels)"""
+    with _LOCK:
+        return {key: dict(value) for key, value in _TOTALS.items()}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text(aggregates=None) -> str:
+    """Aggregate im Prometheus-Textformat"""
+    aggregates = totals() if aggregates is None else aggregates
+    metrics = [
+        ("nba_span_calls_total", "counter", "Anzahl der Span-Aufrufe", "count"),
+        ("nba_span_wall_seconds_total", "counter", "Summierte Wandzeit", "wall_seconds"),
+        ("nba_span_cpu_seconds_total", "counter", "Summierte CPU-Zeit", "cpu_seconds"),
+        ("nba_span_peak_bytes", "gauge", "Größter Speicherzuwachs (tracemalloc)", "peak_bytes"),
+    ]
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for (name, labels), values in sorted(aggregates.items()):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in (("span", name),) + labels)
+            lines.append(f"{metric}{{{label_text}}} {values[field]}")
+    return "\n".join(lines) + "\n"
+
+
+def read_log(path=PERF_FILE) -> dict:
+    """Aggregiert eine JSON-Lines-Logdatei wie ``totals``"""
+    aggregates = defaultdict(_empty_totals)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                _accumulate(aggregates, json.loads(line))
+    return dict(aggregates)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(prometheus_text(read_log(sys.argv[1] if len(sys.argv) > 1 else PERF_FILE)))
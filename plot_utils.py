@@ -0,0 +1,415 @@
+import hashlib
+import io
+import json
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from analysis_utils import (
+    CORR_DROP_COLS, MVP_METRICS, clustered_correlation, feature_bounds, mvp_season_averages, mvp_tables,
+    position_percentile_index
+)
+from data_utils import dataset_hash, load_dataset, load_derived
+from import_utils import lazy_import
+from model_utils import ML_DATASET
+from perf_utils import span
+from style_utils import DARK_THEME, apply_dark_theme
+
+
+def _use_agg():
+    import matplotlib
+
+    # Nicht-interaktives Backend für den Server – muss vor pyplot gesetzt werden
+    matplotlib.use("Agg")
+
+
+# pyplot wird erst beim ersten Rendern geladen; gecachte Diagramme brauchen es nicht
+plt = lazy_import("matplotlib.pyplot", before=_use_agg)
+sns = lazy_import("seaborn")
+go = lazy_import("plotly.graph_objects")
+plotly_subplots = lazy_import("plotly.subplots")
+
+# Gerenderte Diagramme: (Name, Daten-Hash, Theme, Größe, Parameter, Format, dpi) -> Bytes
+FIGURE_CACHE_SIZE = 256
+_FIGURES = OrderedDict()
+_LOCK = threading.Lock()
+# pyplot ist nicht threadsicher – Sessions rendern nacheinander
+_RENDER_LOCK = threading.RLock()
+
+THEME_KEY = hashlib.md5(json.dumps(DARK_THEME, sort_keys=True).encode()).hexdigest()[:12]
+
+# Zähler über erzeugte und geschlossene Figuren (für Soak-Tests)
+_COUNTS = {"created": 0, "closed": 0}
+
+
+@contextmanager
+def dark_figure(figsize, **kwargs):
+    """Erzeugt Figur und Achse im dunklen Thema und schließt die Figur garantiert wieder"""
+    with _RENDER_LOCK:
+        apply_dark_theme()
+        fig, ax = plt.subplots(figsize=figsize, **kwargs)
+        with _LOCK:
+            _COUNTS["created"] += 1
+        try:
+            yield fig, ax
+        finally:
+            plt.close(fig)
+            with _LOCK:
+                _COUNTS["closed"] += 1
+
+
+def live_figures() -> int:
+    """Anzahl der aktuell offenen pyplot-Figuren"""
+    if "matplotlib.pyplot" not in sys.modules:
+        return 0
+    return len(plt.get_fignums())
+
+
+def figure_bytes(name, render, data_key, figsize, params=(), fmt="png", dpi=200) -> bytes:
+    """Rendert ein Matplotlib-Diagramm einmal und liefert danach die gecachten Bytes.
+
+    ``render(ax)`` zeichnet in eine frische Achse mit dunklem Thema. Der Cache-Schlüssel
+    enthält Daten-Hash, Theme und Größe; ``params`` unterscheidet parametrisierte
+    Diagramme (z. B. je Saison), die erst bei der ersten Anfrage gerendert werden.
+    """
+    key = (name, data_key, THEME_KEY, tuple(figsize), tuple(params), fmt, dpi)
+    with _LOCK:
+        if key in _FIGURES:
+            _FIGURES.move_to_end(key)
+            return _FIGURES[key]
+
+    with span("chart.render", chart=name), dark_figure(figsize) as (fig, ax):
+        render(ax)
+        buffer = io.BytesIO()
+        # gleiche Voreinstellungen wie st.pyplot
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+
+    data = buffer.getvalue()
+    with _LOCK:
+        _FIGURES[key] = data
+        while len(_FIGURES) > FIGURE_CACHE_SIZE:
+            _FIGURES.popitem(last=False)
+    return data
+
+
+def figure_cache_stats() -> dict:
+    """Anzahl und Gesamtgröße der gecachten Diagramme sowie offene/erzeugte Figuren"""
+    with _LOCK:
+        return {
+            "figures": len(_FIGURES),
+            "bytes": sum(len(b) for b in _FIGURES.values()),
+            "live": live_figures(),
+            **_COUNTS,
+        }
+
+
+# ------------------------------------------------------------------
+# Statische Diagramme der Seiten (vom Warm-up mit denselben Schlüsseln gerendert)
+# ------------------------------------------------------------------
+def draft_boxplot(path="data/data_analyse_60_height_draft.csv") -> bytes:
+    """Success Score je Draftgruppe (Explorative Analyse)"""
+    draft = load_dataset(path)
+
+    def render(ax):
+        sns.boxplot(data=draft, x='d_group',
+                    y='success_score',
+                    palette='Set2',
+                    boxprops=dict(edgecolor='white', linewidth=1.5),
+                    whiskerprops=dict(color='white', linewidth=1.5),
+                    capprops=dict(color='white', linewidth=1.5),
+                    flierprops=dict(marker='o', markersize=4,
+                                    markerfacecolor='none', markeredgecolor='white'),
+                    medianprops=dict(color='white', linewidth=2),
+                    ax=ax)
+        ax.set_title('Karriere-Erfolg nach Draftgruppe')
+        ax.set_xlabel('Draftgruppe')
+        ax.set_ylabel('Success Score')
+        ax.grid(True, axis='y')
+        ax.figure.tight_layout()
+
+    return figure_bytes("draft_boxplot", render, dataset_hash(path), (8, 5))
+
+
+def corr_heatmap(clustered_corr):
+    """Interaktive, geclusterte Heatmap"""
+    clustered_corr = clustered_corr.iloc[::-1]
+
+    # 2. Erstellung einer interaktiven, geclusterten Heatmap
+    fig = go.Figure(data=go.Heatmap(
+        z=clustered_corr.values,
+        x=clustered_corr.columns.tolist(),
+        y=clustered_corr.index.tolist(),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        colorbar=dict(title='Korrelation'),
+        hoverongaps=False,
+        text=np.round(clustered_corr.values, 2),
+        texttemplate="%{text}",
+    ))
+
+    # 3. Layout-Anpassung
+    fig.update_layout(
+        title='Korrelationsmatrix mit hierarchischem Clustering',
+        width=800,
+        height=700,
+        xaxis_title="Merkmale",
+        yaxis_title="Merkmale",
+        xaxis=dict(tickangle=45, tickfont=dict(size=10)),
+        yaxis=dict(tickfont=dict(size=10)),
+        margin=dict(l=100, r=50, b=150, t=50),
+    )
+
+    # 4. Hinzufügen von Annotationen zur besseren Lesbarkeit
+    fig.update_traces(
+        hovertemplate="<b>%{y}</b> vs <b>%{x}</b><br>Korrelation: %{z:.2f}<extra></extra>"
+    )
+    return fig
+
+
+def full_corr_heatmap(path="data/numerical_data.csv", drop_cols=CORR_DROP_COLS):
+    """Heatmap aller Merkmale, einmal pro Datenstand aufgebaut und geteilt"""
+    drop_cols = frozenset(drop_cols)
+    return load_derived(path, ("corr_heatmap", drop_cols),
+                        lambda _: corr_heatmap(clustered_correlation(path, drop_cols)))
+
+
+def mvp_age_boxplot(path="data/NBA_Dataset.csv") -> bytes:
+    """Alter der MVP-Kandidaten als Boxplot"""
+    candidates = mvp_tables(path)["candidates"]
+
+    def render(ax):
+        sns.boxplot(data=candidates, x='age',
+                    color='skyblue',
+                    boxprops=dict(edgecolor='white', linewidth=1.5),
+                    whiskerprops=dict(color='white', linewidth=1.5),
+                    capprops=dict(color='white', linewidth=1.5),
+                    flierprops=dict(marker='o', markersize=4,
+                                    markerfacecolor='none', markeredgecolor='white'),
+                    medianprops=dict(color='white', linewidth=2),
+                    ax=ax)
+        ax.set_title('Alter der Spieler mit MVP-Stimmen (Boxplot)', fontsize=12)
+        ax.set_xlabel('Alter')
+        ax.grid(True)
+
+    return figure_bytes("mvp_age_boxplot", render, dataset_hash(path), (7, 4))
+
+
+def mvp_age_histogram(path="data/NBA_Dataset.csv") -> bytes:
+    """Altersverteilung der MVP-Kandidaten"""
+    candidates = mvp_tables(path)["candidates"]
+
+    def render(ax):
+        sns.histplot(candidates['age'],
+                     bins=15,
+                     kde=True,
+                     color='purple',
+                     edgecolor='white',
+                     linewidth=1.5,
+                     alpha=1.0,
+                     ax=ax)
+
+        ax.set_title(
+            'Verteilung des Alters der Spieler mit MVP-Stimmen', fontsize=12)
+        ax.set_xlabel('Alter')
+        ax.set_ylabel('Anzahl der Spieler')
+        ax.grid(True, alpha=0.3)
+
+    return figure_bytes("mvp_age_histogram", render, dataset_hash(path), (7, 4))
+
+
+def mvp_award_histogram(path="data/NBA_Dataset.csv") -> bytes:
+    """Verteilung des MVP-Stimmenanteils (award_share)"""
+    candidates = mvp_tables(path)["candidates"]
+
+    def render(ax):
+        sns.histplot(candidates['award_share'],
+                     bins=30,
+                     kde=True,
+                     color='green',
+                     edgecolor='white',
+                     linewidth=1.5,
+                     alpha=1.0,
+                     ax=ax)
+        ax.set_title('Verteilung der MVP-Stimmen (nur Spieler mit Stimmen)')
+        ax.set_xlabel('MVP-Stimmenanteil (award_share)')
+        ax.set_ylabel('Anzahl der Spieler')
+        ax.grid(True, alpha=0.3)
+
+    return figure_bytes("mvp_award_histogram", render, dataset_hash(path), (10, 5))
+
+
+MVP_METRIC_LABELS = {
+    "pts_per_g": "Punkte/Spiel",
+    "ast_per_g": "Assists/Spiel",
+    "trb_per_g": "Rebounds/Spiel",
+    "per": "Effizienzrating (PER)",
+    "ws": "Gewinnanteil (WS)"
+}
+
+
+def mvp_season_chart(path, season) -> bytes:
+    """Mittelwerte einer Saison je MVP-Status (nur Spieler mit mind. 60 Minuten)"""
+
+    def render(ax):
+        avg_values = mvp_season_averages(mvp_tables(path), season)
+        avg_values["MVP Status"] = avg_values["is_mvp"].map(
+            {True: "MVP-Kandidaten", False: "Andere Spieler"})
+
+        # Melt für Seaborn
+        # melt() macht aus einer Matrix eine Liste – superpraktisch für Visualisierung oder lange Tabellen.
+        melted = avg_values.melt(
+            id_vars="MVP Status", value_vars=MVP_METRICS, var_name="Stat", value_name="Wert")
+        melted["Stat"] = melted["Stat"].map(MVP_METRIC_LABELS)
+
+        sns.barplot(data=melted, x="Stat", y="Wert", hue="MVP Status", ax=ax)
+        ax.set_title(
+            f"Durchschnittliche Leistungskennzahlen von MVP-Kandidaten und anderen Spielern ({season})")
+
+        for p in ax.patches:
+            height = p.get_height()
+            if height > 0:
+                ax.annotate(
+                    f"{height:.1f}",
+                    (p.get_x() + p.get_width() / 2., height),
+                    ha='center',
+                    va='center',
+                    xytext=(0, 5),
+                    textcoords='offset points'
+                )
+
+        ax.tick_params(axis="x", labelrotation=15)
+        ax.set_xlabel("Leistungsmetriken")
+        ax.set_ylabel("Durchschnittswert")
+
+    return figure_bytes("mvp_season_averages", render, dataset_hash(path), (10, 5), params=(season,))
+
+
+def mvp_efficiency(path="data/NBA_Dataset.csv") -> bytes:
+    """Effizienzmetriken (TS%, eFG%) von MVP-Kandidaten und anderen Spielern"""
+    effizienz_means = mvp_tables(path)["efficiency"].T
+    effizienz_means.columns = [
+        'Nicht-MVPs', 'MVP-Kandidaten'] if False in effizienz_means.columns else ['MVP-Kandidaten']
+
+    def render(ax):
+        effizienz_means.plot(kind='bar', ax=ax, color=['#2a9d8f', '#f4a261'])
+        ax.set_title('Durchschnittliche Effizienzmetriken (TS% und eFG%)', fontsize=14)
+        ax.set_ylabel('Wert')
+        ax.set_xlabel('Effizienz-Metrik')
+        ax.grid(axis='y')
+        ax.legend(title='Spielertyp', loc='lower right')
+
+    return figure_bytes("mvp_efficiency", render, dataset_hash(path), (7, 4))
+
+
+# ------------------------------------------------------------------
+# Spielerwerte (Vorhersagemodell): Min/Max-Balken je Position
+# ------------------------------------------------------------------
+FEATURE_TITLES = {
+    "height": "Größe (cm)",
+    "weight": "Gewicht (kg)",
+    "bmi": "BMI (kg/m²)",
+    "draft_age": "Draft Alter",
+    "draft_number": "Draft Nummer",
+    "stand_jump": "Standing Jump (cm)",
+    "max_jump": "Max Jump (cm)",
+    "court_sprint": "Court Sprint (s)",
+    "lane_agility": "Lane Agility (s)",
+    "bench_press": "Bench Press (Wdh)"
+}
+
+# Rundungsregeln pro Feature
+FEATURE_DECIMALS = {
+    "height": 0,
+    "weight": 0,
+    "draft_age": 0,
+    "draft_number": 0,
+    "bench_press": 0,
+    "bmi": 1,
+    "max_jump": 1,
+    "stand_jump": 1,
+    "court_sprint": 2,
+    "lane_agility": 2
+}
+
+FEATURE_CATEGORIES = {
+    "🏀 Physische Attribute": ["height", "weight", "bmi"],
+    "🏆 Draft Infos": ["draft_age", "draft_number"],
+    "🏋️ Combine Werte": ["stand_jump", "max_jump", "court_sprint", "lane_agility", "bench_press"]
+}
+
+# Kompakte Ansicht: Plots pro Zeile
+GRID_COLS = 3
+
+
+def _build_feature_grid(df, lbl):
+    cells = []
+    for cat_features in FEATURE_CATEGORIES.values():
+        cat_features = [f for f in cat_features if f in df.columns]
+        for start in range(0, len(cat_features), GRID_COLS):
+            row = cat_features[start:start + GRID_COLS]
+            cells.extend(row + [None] * (GRID_COLS - len(row)))
+    rows = len(cells) // GRID_COLS
+
+    fig = plotly_subplots.make_subplots(
+        rows=rows, cols=GRID_COLS,
+        subplot_titles=[FEATURE_TITLES.get(f, f) if f else "" for f in cells],
+        vertical_spacing=0.12,
+    )
+    percentiles = position_percentile_index()
+    axis_refs = {}
+    for idx, feature in enumerate(cells):
+        if feature is None:
+            continue
+        row, col = divmod(idx, GRID_COLS)
+        row, col = row + 1, col + 1
+        min_score, max_score = feature_bounds(percentiles, lbl, feature)
+        if max_score is None:
+            max_score = min_score
+        decimals = FEATURE_DECIMALS.get(feature, 2)
+        subplot = fig.get_subplot(row, col)
+        # Achsenreferenzen ("x2", "y2") für die spätere Spielermarkierung
+        axis_refs[feature] = (subplot.yaxis.anchor, subplot.xaxis.anchor)
+
+        fig.add_trace(go.Bar(
+            x=[feature],
+            y=[max_score - min_score],
+            base=min_score,
+            width=0.4,
+            marker=dict(color="gray", opacity=0.3),
+            hoverinfo="skip",
+            showlegend=False
+        ), row=row, col=col)
+        fig.add_annotation(x=0, y=min_score, text=f"Min: {min_score:.{decimals}f}", showarrow=False,
+                           font=dict(color="white", size=13), yshift=-15, row=row, col=col)
+        fig.add_annotation(x=0, y=max_score, text=f"Max: {max_score:.{decimals}f}", showarrow=False,
+                           font=dict(color="white", size=13), yshift=10, row=row, col=col)
+        fig.update_yaxes(
+            range=[min_score - (0.05 * abs(max_score)), max_score + (0.05 * abs(max_score))],
+            tickfont=dict(color="white"), row=row, col=col
+        )
+
+    fig.update_xaxes(showticklabels=False)
+    fig.update_annotations(font_color="white")
+    fig.update_layout(
+        height=260 * rows,
+        plot_bgcolor="#0E1117",
+        paper_bgcolor="#0E1117",
+        margin=dict(l=40, r=40, t=60, b=20),
+        showlegend=False
+    )
+    # Als dict gecacht: Markierungen kommen per dict-Merge dazu statt über add_shape/add_annotation,
+    # die bei jedem Aufruf validieren; st.plotly_chart validiert die fertige Figur einmal
+    return fig.to_dict(), axis_refs
+
+
+def feature_grid(lbl, path=ML_DATASET):
+    """Statischer Teil der kompakten Ansicht: alle Min/Max-Balken einer Position in einer Figur.
+
+    Liefert ``(figur_dict, achsen)`` mit den Achsenreferenzen je Feature; einmal pro
+    Datenstand und Position aufgebaut.
+    """
+    return load_derived(path, ("feature_grid", lbl), lambda df: _build_feature_grid(df, lbl))
@@ -1,5 +1,10 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+
+from asset_utils import read_text
+from import_utils import lazy_import
+
+# Matplotlib erst laden, wenn tatsächlich ein Diagramm gerendert wird
+mpl = lazy_import("matplotlib")
 
 def set_app_config(title: str, icon: str = "📊", layout: str = "wide"):
     st.set_page_config(
@@ -9,22 +14,41 @@ def set_app_config(title: str, icon: str = "📊", layout: str = "wide"):
     )
 
 def load_custom_css(path="nba_dark_style.css"):
-    with open(path) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    print("🔵 CSS wurde geladen.")    
+    # Datei nur beim ersten Aufruf bzw. nach Änderungen lesen
+    css, fresh = read_text(path)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    if fresh:
+        print("🔵 CSS wurde geladen.")
+
+# Matplotlib-Einstellungen des dunklen Themas
+DARK_THEME = {
+    'figure.facecolor': '#0E1117',
+    'axes.facecolor': '#0E1117',
+    'axes.edgecolor': 'white',
+    'axes.labelcolor': 'white',
+    'text.color': 'white',
+    'xtick.color': 'white',
+    'ytick.color': 'white',
+    'grid.color': 'grey',
+    'lines.linewidth': 1.5,
+    'axes.linewidth': 1.5,
+    'grid.linewidth': 0.8,
+}
 
 def apply_dark_theme():
     """Wendet die Einstellungen des dunklen Themas auf das aktuelle Diagramm an"""
-    plt.rcParams.update({
-        'figure.facecolor': '#0E1117',
-        'axes.facecolor': '#0E1117',
-        'axes.edgecolor': 'white',
-        'axes.labelcolor': 'white',
-        'text.color': 'white',
-        'xtick.color': 'white',
-        'ytick.color': 'white',
-        'grid.color': 'grey',
-        'lines.linewidth': 1.5,
-        'axes.linewidth': 1.5,
-        'grid.linewidth': 0.8,
-    })
\ No newline at end of file
+    mpl.rcParams.update(DARK_THEME)
+
+def section_nav(sections, key):
+    """Horizontale Abschnittsauswahl statt ``st.tabs`` – nur der gewählte Abschnitt läuft"""
+    return st.radio("Abschnitt", sections, key=key, horizontal=True, label_visibility="collapsed")
+
+def keep_widget_state(defaults: dict):
+    """Hält Widget-Werte über Reruns, auch wenn das Widget gerade nicht angezeigt wird.
+
+    Aufrufbare Standardwerte werden erst berechnet, wenn der Schlüssel noch fehlt.
+    """
+    for key, value in defaults.items():
+        if key not in st.session_state and callable(value):
+            value = value()
+        st.session_state[key] = st.session_state.get(key, value)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+import data_utils
+
+
+def test_parquet_and_csv_paths_return_same_dtypes(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_utils, "CACHE_DIR", tmp_path / "cache")
+    source = tmp_path / "data_analyse_60_height_draft.csv"
+    pd.DataFrame({
+        "player": ["A", "B", "C"],
+        "pos_cluster_calc": ["Big", "Guard", "Wing"],
+        "d_group": [1, 7, 2],
+        "team_id": ["LAL", "GSW", "LAL"],
+        "draft_number": [3, 61, 12],
+        "career_years": [10, 2, 5],
+        "all_star_total": [4, 0, 1],
+        "sum_mp": [30000.5, 1200.0, 8000.25],
+        "player_height": [210.82, 190.5, 200.66],
+    }).to_csv(source, index=False)
+
+    from_csv = data_utils._read_csv(source)
+    assert data_utils._columnar_fresh(source)
+    from_parquet = data_utils._read_csv(source)
+
+    pd.testing.assert_series_equal(from_csv.dtypes, from_parquet.dtypes)
+    assert isinstance(from_parquet["d_group"].dtype, pd.CategoricalDtype)
+    # nur gelistete Spalten werden nach float32 verkleinert
+    assert from_parquet["player_height"].dtype == "float32"
+    assert from_parquet["sum_mp"].dtype == "float64"
+    pd.testing.assert_frame_equal(from_csv, from_parquet)
+
+
+def test_write_atomic_keeps_old_file_when_write_fails(tmp_path):
+    target = tmp_path / "cache" / "artifact.bin"
+    data_utils.write_atomic(target, lambda tmp: tmp.write_bytes(b"alt"))
+
+    def broken(tmp):
+        tmp.write_bytes(b"halb")
+        raise OSError("Platte voll")
+
+    try:
+        data_utils.write_atomic(target, broken)
+    except OSError:
+        pass
+    assert target.read_bytes() == b"alt"
+    assert [p.name for p in target.parent.iterdir()] == ["artifact.bin"]
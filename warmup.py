@@ -0,0 +1,205 @@
+"""Warm-up: füllt alle Caches, bevor Nutzer kommen.
+
+Lädt Datensätze, abgeleitete Indizes und Aggregate, Modelle (inkl. einer
+Dummy-Vorhersage je Position), Hold-out-Tabellen, Antwortflächen und rendert die
+statischen Diagramme der Seiten. Im Serverbetrieb (``streamlit run app.py``) startet es einmal beim
+Serverstart; ``python warmup.py --check`` fragt den Status des laufenden Servers unter
+``/warmup`` ab und liefert Exit-Code 0, sobald er bereit ist. Nach Abschluss wird zusätzlich
+``data/cache/ready.json`` als Protokoll geschrieben.
+
+Beispiele:
+    python warmup.py            # baut Artefakte auf der Platte vor (füllt nicht den Server-Speicher)
+    python warmup.py --check    # Health-Check gegen den laufenden Server
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from data_utils import CACHE_DIR, DATA_DIR, load_dataset, player_index
+from perf_utils import span
+
+READY_FILE = CACHE_DIR / "ready.json"
+HEALTH_URL = "http://localhost:8501/warmup"
+
+_STATE = {"status": "idle", "steps": {}, "error": None}
+_LOCK = threading.Lock()
+_THREAD = None
+
+
+def _warm_data():
+    for name in ["1_dataset_ML.pkl", "numerical_data.csv", "data_analyse_60_height_draft.csv", "NBA_Dataset.csv"]:
+        path = DATA_DIR / name
+        if path.exists():
+            load_dataset(path)
+
+
+def _warm_aggregates():
+    from analysis_utils import (
+        clustered_correlation, draft_filter_index, mvp_tables, position_percentile_index, three_point_cube
+    )
+
+    position_percentile_index()
+    clustered_correlation(DATA_DIR / "numerical_data.csv")
+    draft_filter_index()
+    nba = DATA_DIR / "NBA_Dataset.csv"
+    if nba.exists():
+        three_point_cube(nba)
+        mvp_tables(nba)
+        player_index(nba)
+
+
+def _warm_models():
+    from feature_utils import FEATURE_COLS
+    from model_utils import (
+        ML_DATASET, available_positions, get_model, holdout_predictions, predict_one, response_surface
+    )
+
+    df = load_dataset(ML_DATASET)
+    for lbl in available_positions():
+        get_model(lbl)
+        # Dummy-Vorhersage mit dem Median-Spieler initialisiert sklearn/NumPy-Pfade
+        median = df.loc[df["pos_cluster"] == lbl, FEATURE_COLS].median()
+        predict_one(lbl, pd.DataFrame([median]))
+        holdout_predictions(lbl)
+        response_surface(lbl)
+
+
+def _warm_charts():
+    from analysis_utils import mvp_tables
+    from model_utils import available_positions
+    from plot_utils import (
+        draft_boxplot, feature_grid, full_corr_heatmap, mvp_age_boxplot, mvp_age_histogram, mvp_award_histogram,
+        mvp_efficiency, mvp_season_chart
+    )
+
+    # Dieselben Funktionen (und damit Cache-Schlüssel) wie in den Seiten
+    draft = DATA_DIR / "data_analyse_60_height_draft.csv"
+    if draft.exists():
+        draft_boxplot(draft)
+    numerical = DATA_DIR / "numerical_data.csv"
+    if numerical.exists():
+        full_corr_heatmap(numerical)
+    nba = DATA_DIR / "NBA_Dataset.csv"
+    if nba.exists():
+        for chart in (mvp_age_boxplot, mvp_age_histogram, mvp_award_histogram, mvp_efficiency):
+            chart(nba)
+        # weitere Saisons werden erst bei Auswahl gerendert; vorgewählt ist die erste
+        seasons = mvp_tables(nba)["seasons"]
+        if seasons:
+            mvp_season_chart(nba, seasons[0])
+    for lbl in available_positions():
+        feature_grid(lbl)
+
+
+STEPS = [
+    ("data", _warm_data),
+    ("aggregates", _warm_aggregates),
+    ("models", _warm_models),
+    ("charts", _warm_charts),
+]
+
+
+def _write_marker(mode):
+    payload = {**status(), "mode": mode, "pid": os.getpid(), "finished_at": time.time()}
+    READY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    # eigene Temp-Datei je Prozess, danach atomar über die alte Marke ersetzen
+    tmp = READY_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    tmp.replace(READY_FILE)
+
+
+def warm_up(mode="cli") -> dict:
+    """Führt alle Warm-up-Schritte nacheinander aus und schreibt die Bereitschaftsmarke"""
+    with _LOCK:
+        _STATE.update(status="warming", steps={}, error=None)
+
+    try:
+        for name, step in STEPS:
+            start = time.perf_counter()
+            with span("warmup.step", step=name):
+                step()
+            with _LOCK:
+                _STATE["steps"][name] = round(time.perf_counter() - start, 3)
+    except Exception as exc:  # noqa: BLE001 – Fehler melden statt den Server zu stoppen
+        with _LOCK:
+            _STATE.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+        _write_marker(mode)
+        raise
+
+    with _LOCK:
+        _STATE["status"] = "ready"
+    _write_marker(mode)
+    return status()
+
+
+def start_background() -> bool:
+    """Startet das Warm-up einmal pro Prozess in einem Hintergrund-Thread"""
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None:
+            return False
+
+        def run():
+            try:
+                warm_up(mode="server")
+            except Exception:  # noqa: BLE001 – Status steht bereits auf "failed"
+                pass
+
+        _THREAD = threading.Thread(target=run, name="warmup", daemon=True)
+        _THREAD.start()
+        return True
+
+
+def status() -> dict:
+    """Aktueller Warm-up-Status dieses Prozesses"""
+    with _LOCK:
+        return {"status": _STATE["status"], "steps": dict(_STATE["steps"]), "error": _STATE["error"]}
+
+
+def is_ready() -> bool:
+    return status()["status"] == "ready"
+
+
+def check(url=HEALTH_URL) -> tuple:
+    """Fragt den Warm-up-Status des laufenden Servers ab: (bereit, Meldung)"""
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            state = json.load(response)
+    except urllib.error.HTTPError as exc:
+        # 503: Server läuft, Warm-up aber noch nicht abgeschlossen
+        state = json.load(exc)
+    except (urllib.error.URLError, OSError) as exc:
+        return False, f"Server nicht erreichbar ({url}): {exc}"
+    if state["status"] == "failed":
+        return False, f"warm-up fehlgeschlagen: {state['error']}"
+    if state["status"] != "ready":
+        return False, f"warm-up {state['status']}"
+    total = sum(state["steps"].values())
+    return True, f"bereit ({total:.1f}s)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Caches vorwärmen bzw. Bereitschaft prüfen")
+    parser.add_argument("--check", action="store_true", help="nur Bereitschaft prüfen (Exit-Code 0 = bereit)")
+    parser.add_argument("--url", default=HEALTH_URL, help="Status-Endpunkt des Servers")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        ready, message = check(args.url)
+        print(("✅ " if ready else "⏳ ") + message)
+        sys.exit(0 if ready else 1)
+
+    result = warm_up()
+    steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result["steps"].items())
+    print(f"✅ Warm-up abgeschlossen ({steps}) -> {READY_FILE}")
+
+
+if __name__ == "__main__":
+    main()